@@ -1,13 +1,18 @@
 import cv2
-import pytesseract
 import os
+import json
 import tkinter as tk
 from tkinter import ttk, Label, Button
 from PIL import Image, ImageTk
 import threading
 from datetime import datetime
 import numpy as np
-from util import get_parking_spots_bboxes, empty_or_not
+from spot_layout import load_spot_layout, SpotIndex, RegionOfInterest
+from occupancy import OccupancyAnalyzer
+from frame_source import FrameReader
+from occupancy_events import OccupancyEventStream, EmptySlotsExporter
+from ocr_engine import get_engine
+from plate_engine import PlateEngine
 
 # MQTT için gereken kütüphane
 import paho.mqtt.client as mqtt
@@ -22,23 +27,34 @@ class ModernParkingSystem:
         # Global değişkenler
         self.selected_spot = None
         self.spots = []
+        self.spot_index = None
+        self.roi = None
         
         # Doluluk %50 altındaysa indirim butonu aktif olsun diye takip edeceğimiz flag
         self.discount_active = False
         
+        # Arka plan analizinin hazırladığı son kare; arayüz yalnızca ana döngüde güncellenir
+        self.display_size = (1000, 600)
+        self.display_buffer = np.zeros((self.display_size[1], self.display_size[0], 3), dtype=np.uint8)
+        self.display_counts = None
+        self.shown_counts = None
+        self.parking_photo = None
+        self.render_pending = threading.Event()
+        
         # Yollar
         self.PATHS = {
-            'tessdata': r"C:\Program Files\Tesseract-OCR\tessdata",
-            'tesseract': r'C:\Program Files\Tesseract-OCR\tesseract.exe',
             'mask': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\mask_1920_1080.png",
             'video': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\parking_1920_1080_loop.mp4",
             'parking_data': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\parking_data.txt",
-            'plate_image': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\2.jpg"
+            'plate_image': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\2.jpg",
+            'empty_slots': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\empty_slots.txt",
+            'occupancy_log': r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\occupancy_events.csv"
         }
         
-        # Tesseract ayarları
-        os.environ["TESSDATA_PREFIX"] = self.PATHS['tessdata']
-        pytesseract.pytesseract.tesseract_cmd = self.PATHS['tesseract']
+        # Tesseract bir kez başlatılır ve açık tutulur (yollar: TESSDATA_PREFIX / TESSERACT_CMD)
+        self.ocr = get_engine(psm=8)
+        # Plaka hattı aşama sürelerini ölçer; son çağrının dökümü report() ile alınır
+        self.plate_engine = PlateEngine(self.ocr)
         
         # Stil ayarları
         self.setup_styles()
@@ -173,43 +189,21 @@ class ModernParkingSystem:
 
     def handle_click(self, event):
         """Videodaki park alanına tıklanması durumunda seçili alanı günceller."""
-        # Etiket boyutu: 1000x600 -> Orijinal boyut: 1920x1080
-        click_x = event.x * (1920/1000)
-        click_y = event.y * (1080/600)
-        
-        for idx, (x, y, w, h) in enumerate(self.spots):
-            if x <= click_x <= x+w and y <= click_y <= y+h:
-                self.selected_spot = idx+1
-                self.selected_label.config(text=f"Seçilen Park Alanı: {self.selected_spot}")
-                break
+        if self.spot_index is None:
+            return
+        
+        # Tıklama gösterim boyutundan kırpılan bölgeye, oradan tam kare koordinatına çevrilir
+        roi_x = event.x * self.roi.output_size[0] / self.display_size[0]
+        roi_y = event.y * self.roi.output_size[1] / self.display_size[1]
+        idx = self.spot_index.spot_at(*self.roi.to_frame(roi_x, roi_y))
+        if idx is not None:
+            self.selected_spot = idx+1
+            self.selected_label.config(text=f"Seçilen Park Alanı: {self.selected_spot}")
 
     def process_frame(self, frame):
         """Plaka okumak için gelen görüntü üzerinde OCR işlemi yapar."""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        filtered = cv2.bilateralFilter(gray, 11, 17, 17)
-        edges = cv2.Canny(filtered, 170, 200)
-        
-        contours, _ = cv2.findContours(edges.copy(), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-        contours = sorted(contours, key=cv2.contourArea, reverse=True)[:10]
-        
-        for contour in contours:
-            perimeter = cv2.arcLength(contour, True)
-            epsilon = 0.018 * perimeter
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            if len(approx) == 4:
-                x, y, w, h = cv2.boundingRect(approx)
-                plate_img = frame[y:y+h, x:x+w]
-                
-                plate_gray = cv2.cvtColor(plate_img, cv2.COLOR_BGR2GRAY)
-                _, plate_thresh = cv2.threshold(plate_gray, 150, 255, cv2.THRESH_BINARY)
-                
-                text = pytesseract.image_to_string(plate_thresh, config="--psm 8")
-                text = ''.join(filter(str.isalnum, text))
-                
-                if text.strip():
-                    return text.strip()
-        return None
+        # Aşama süreleri plate_engine.report() / stats() ile okunabilir
+        return self.plate_engine.recognize(frame)
 
     def get_or_update_plate_data(self, plate):
         """Plakayı kayıt dosyasına yazar ve eski/yeni müşteri durumunu belirler."""
@@ -267,53 +261,87 @@ class ModernParkingSystem:
 
     def analyze_parking(self):
         """Video kaynağından gelen kareleri analiz ederek otopark doluluğunu hesaplar."""
-        cap = cv2.VideoCapture(self.PATHS['video'])
-        mask = cv2.imread(self.PATHS['mask'], 0)
-        
-        connected_components = cv2.connectedComponentsWithStats(mask, 4, cv2.CV_32S)
-        self.spots = get_parking_spots_bboxes(connected_components)
-        spots_status = [None] * len(self.spots)
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                # Döngü bitince yeniden başa sar
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                continue
-            
-            # Her karede park alanlarını kontrol et
-            for idx, (x, y, w, h) in enumerate(self.spots):
-                spot_img = frame[y:y+h, x:x+w]
-                spots_status[idx] = empty_or_not(spot_img)
-                color = (0, 255, 0) if spots_status[idx] else (0, 0, 255)
-                cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                cv2.putText(frame, str(idx+1), (x+5, y+25),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2)
+        # Park düzeni maskeden bir kez çıkarılır, maske değişene kadar önbellekten okunur
+        layout = load_spot_layout(self.PATHS['mask'])
+        
+        # Kareler park alanlarını kapsayan bölgeye kırpılır; çizim ve analiz bu bölgede yapılır
+        self.roi = RegionOfInterest(layout)
+        self.spots = self.roi.spots
+        self.spot_index = SpotIndex(layout)
+        analyzer = OccupancyAnalyzer(self.spots)
+        
+        # Doluluk yalnızca değişiklik olayları olarak yayınlanır; dosya ve MQTT aboneleri bu akışı dinler
+        events = OccupancyEventStream(len(self.spots), log_path=self.PATHS['occupancy_log'])
+        events.subscribe(EmptySlotsExporter(self.PATHS['empty_slots']))
+        events.subscribe(self.publish_spot_events)
+        display_bgr = np.empty_like(self.display_buffer)
+        
+        # Kareler ayrı bir iş parçacığında çözülür; video bitince başa sarılır
+        reader = FrameReader(self.PATHS['video'], loop=True).start()
+        for _, _, frame in reader:
+            frame = self.roi.apply(frame)
             
-            empty_count = sum(spots_status)
+            # Yalnızca görüntüsü değişen park alanlarını, kare bütçesine sığdığı kadar yeniden sınıflandır
+            spots_status = analyzer.update(frame)
+            events.update(spots_status, analyzer.margins, known=analyzer.classified)
+
+            empty_count = events.empty_count
             total = len(self.spots)
             fullness_percentage = (empty_count * 100) // total
             
-            self.parking_label.config(
-                text=f"🅿️ Boş Alan: {empty_count}/{total} | 📊 Doluluk: %{fullness_percentage}"
-            )
+            # Arayüz önceki kareyi henüz çizmediyse bu kareyi çizmeden atla
+            if not self.render_pending.is_set():
+                for idx, (x, y, w, h) in enumerate(self.spots):
+                    color = (0, 255, 0) if spots_status[idx] else (0, 0, 255)
+                    cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+                    cv2.putText(frame, str(idx+1), (x+5, y+25),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255,255,255), 2)
+                
+                # Görüntüyü yeniden kullanılan gösterim tamponuna yaz
+                cv2.resize(frame, self.display_size, dst=display_bgr)
+                cv2.cvtColor(display_bgr, cv2.COLOR_BGR2RGB, dst=self.display_buffer)
+                self.display_counts = (empty_count, total, fullness_percentage)
+                self.render_pending.set()
+
+        reader.stop()
+        events.close()
+
+    def render_parking_view(self):
+        """Hazırlanan son kareyi ve değişen doluluk bilgilerini Tk ana döngüsünde gösterir."""
+        if self.render_pending.is_set():
+            if self.display_counts != self.shown_counts:
+                empty_count, total, fullness_percentage = self.display_counts
+                self.parking_label.config(
+                    text=f"🅿️ Boş Alan: {empty_count}/{total} | 📊 Doluluk: %{fullness_percentage}"
+                )
+                
+                # Doluluk %50’nin altına düştüyse indirim butonunu aç
+                if fullness_percentage < 50:
+                    self.discount_active = True
+                    self.discount_button["state"] = "normal"
+                else:
+                    self.discount_active = False
+                    self.discount_button["state"] = "disabled"
+                self.shown_counts = self.display_counts
             
-            # Doluluk %50’nin altına düştüyse indirim butonunu aç
-            if fullness_percentage < 50:
-                self.discount_active = True
-                self.discount_button["state"] = "normal"
+            # PhotoImage bir kez oluşturulur, sonraki karelerde yerinde güncellenir
+            img = Image.fromarray(self.display_buffer)
+            if self.parking_photo is None:
+                self.parking_photo = ImageTk.PhotoImage(img)
+                self.parking_image_label.config(image=self.parking_photo)
             else:
-                self.discount_active = False
-                self.discount_button["state"] = "disabled"
-            
-            # Görüntüyü GUI'de göster
-            frame = cv2.resize(frame, (1000, 600))
-            img = ImageTk.PhotoImage(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
-            self.parking_image_label.config(image=img)
-            self.parking_image_label.image = img
-            
-            if cv2.waitKey(25) & 0xFF == ord('q'):
-                break
+                self.parking_photo.paste(img)
+            self.render_pending.clear()
+        
+        self.root.after(30, self.render_parking_view)
+
+    def publish_spot_events(self, events, stream):
+        """Park alanı durum değişikliklerini MQTT üzerinden yayınlar."""
+        message = json.dumps([
+            {"spot": event.spot_id, "empty": event.new, "timestamp": event.timestamp}
+            for event in events
+        ])
+        self.mqtt_client.publish("parking/spots", message)
 
     def publish_discount(self):
         """İndirim bildirimi MQTT üzerinden gönderilir."""
@@ -326,8 +354,9 @@ class ModernParkingSystem:
             pass
 
     def start_analysis(self):
-        """Analiz iş parçacığını başlatır."""
+        """Analiz iş parçacığını ve arayüz çizim döngüsünü başlatır."""
         threading.Thread(target=self.analyze_parking, daemon=True).start()
+        self.root.after(30, self.render_parking_view)
 
 if __name__ == "__main__":
     root = tk.Tk()
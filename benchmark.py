@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import cv2
+import numpy as np
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(func, repeats=5, warmup=1):
+    """func'ı tekrar tekrar çalıştırır; en iyi, medyan ve ortalama süreleri (saniye) döndürür."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'repeats': repeats,
+        'best_s': min(timings),
+        'median_s': float(np.median(timings)),
+        'mean_s': float(np.mean(timings)),
+    }
+
+
+# Sentetik girdi üreticileri
+
+def synthetic_frames(size=(1920, 1080), count=4, seed=0):
+    """1.jpg–4.jpg görüntülerinden maske boyutunda, hafif gürültülü kareler üretir."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for idx in range(count):
+        img = cv2.imread(os.path.join(BASE_DIR, f"{idx % 4 + 1}.jpg"))
+        if img is None:
+            img = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+        img = cv2.resize(img, size)
+        noise = rng.integers(-4, 5, img.shape, dtype=np.int16)
+        frames.append(np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def synthetic_mask(spot_count, size=(1920, 1080)):
+    """spot_count adet dikdörtgen park alanı içeren ızgara maskesi üretir."""
+    mask = np.zeros((size[1], size[0]), dtype=np.uint8)
+    cols = int(np.ceil(np.sqrt(spot_count * size[0] / size[1])))
+    rows = int(np.ceil(spot_count / cols))
+    cell_w, cell_h = size[0] // cols, size[1] // rows
+
+    for idx in range(spot_count):
+        row, col = divmod(idx, cols)
+        x, y = col * cell_w, row * cell_h
+        # Komşu alanlar birleşmesin diye her hücrede boşluk bırakılır
+        mask[y + 1:y + max(cell_h - 1, 2), x + 1:x + max(cell_w - 1, 2)] = 255
+    return mask
+
+
+def synthetic_spots(spot_count, size=(1920, 1080)):
+    from util import get_parking_spots_bboxes
+
+    return get_parking_spots_bboxes(cv2.connectedComponentsWithStats(synthetic_mask(spot_count, size), 4, cv2.CV_32S))
+
+
+def synthetic_parking_log(path, records, seed=0):
+    """parking_data2.txt biçiminde (plaka,tarih,saat) sentetik kayıt dosyası yazar."""
+    rng = random.Random(seed)
+    plates = [f"{rng.randint(1, 81):02d}{''.join(rng.choices('ABCDEFGHJKLMNPRSTUVYZ', k=3))}{rng.randint(100, 999)}"
+              for _ in range(max(records // 20, 1))]
+
+    current = datetime(2024, 1, 1)
+    step = timedelta(days=365) / max(records, 1)
+    with open(path, 'w') as f:
+        for _ in range(records):
+            current += step
+            f.write(f"{rng.choice(plates)},{current.strftime('%Y-%m-%d,%H:%M:%S')}\n")
+
+
+# Ölçülen sıcak yollar
+
+def bench_spot_layout(sizes, repeats):
+    from util import get_parking_spots_bboxes
+
+    results = []
+    for spot_count in sizes:
+        mask = synthetic_mask(spot_count)
+        components = cv2.connectedComponentsWithStats(mask, 4, cv2.CV_32S)
+        results.append(dict(name='connectedComponentsWithStats', size=spot_count,
+                            **measure(lambda: cv2.connectedComponentsWithStats(mask, 4, cv2.CV_32S), repeats)))
+        results.append(dict(name='get_parking_spots_bboxes', size=spot_count,
+                            **measure(lambda: get_parking_spots_bboxes(components), repeats)))
+    return results
+
+
+def bench_classifier(sizes, repeats):
+    from occupancy import OccupancyAnalyzer
+    from util import empty_or_not, empty_or_not_batch, SpotFeatureExtractor
+
+    frame = synthetic_frames(count=1)[0]
+    results = []
+    for spot_count in sizes:
+        spots = synthetic_spots(spot_count)
+        extractor = SpotFeatureExtractor(spots)
+
+        def per_spot():
+            for x, y, w, h in spots:
+                empty_or_not(frame[y:y + h, x:x + w])
+
+        results.append(dict(name='empty_or_not', size=spot_count, **measure(per_spot, repeats)))
+        results.append(dict(name='empty_or_not_batch', size=spot_count,
+                            **measure(lambda: empty_or_not_batch(frame, extractor), repeats)))
+
+        # Durağan sahnede değişim kapısından geçen kare maliyeti
+        analyzer = OccupancyAnalyzer(spots, frame_budget=None)
+        results.append(dict(name='OccupancyAnalyzer.update (static)', size=spot_count,
+                            **measure(lambda: analyzer.update(frame), repeats)))
+    return results
+
+
+def bench_ocr(repeats):
+    from plate_engine import STAGES, PlateEngine
+
+    engines = {
+        'PlateEngine.read': PlateEngine(),
+        # 1080p kareyi kaba ölçekte tarayıp yalnızca aday bölgelerini tam çözünürlükte işler
+        'PlateEngine.read (coarse 960)': PlateEngine(coarse_width=960),
+    }
+    results = []
+    for idx in range(1, 5):
+        frame = cv2.imread(os.path.join(BASE_DIR, f"{idx}.jpg"))
+        if frame is None:
+            continue
+        frame = cv2.resize(frame, (1920, 1080))
+        size = f"{idx}.jpg 1920x1080"
+        for name, engine in engines.items():
+            engine.reset_stats()
+            result = dict(name=name, size=size, **measure(lambda: engine.read(frame), repeats))
+            # Sürenin hangi aşamada harcandığı (ısınma turu dahil aşama başına ortalama)
+            stats = engine.stats()
+            result['stages_mean_s'] = {stage: stats['stages'][stage]['mean_s'] for stage in STAGES}
+            result['plates'] = stats['counters'].get('plates', 0)
+            results.append(result)
+    return results
+
+
+def bench_analytics(sizes, repeats):
+    from otopark_analiz_araci import OtoparkAnalizAraci
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.chdir(tmp_dir):
+        for records in sizes:
+            # veri_yukle çalışma klasöründeki parking_data2.txt dosyasını okur
+            synthetic_parking_log('parking_data2.txt', records)
+
+            # Tk penceresi açmadan yalnızca veri ve metrik yollarını ölç
+            araci = OtoparkAnalizAraci.__new__(OtoparkAnalizAraci)
+            with contextlib.redirect_stdout(None):
+                results.append(dict(name='OtoparkAnalizAraci.veri_yukle', size=records,
+                                    **measure(araci.veri_yukle, repeats)))
+                results.append(dict(name='OtoparkAnalizAraci.metrikleri_hesapla', size=records,
+                                    **measure(araci.metrikleri_hesapla, repeats)))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(spot_sizes, log_sizes, repeats):
+    suites = {
+        'spot_layout': lambda: bench_spot_layout(spot_sizes, repeats),
+        'classifier': lambda: bench_classifier(spot_sizes, repeats),
+        'ocr': lambda: bench_ocr(repeats),
+        'analytics': lambda: bench_analytics(log_sizes, repeats),
+    }
+
+    results, skipped = [], {}
+    for suite, run in suites.items():
+        try:
+            for result in run():
+                result['suite'] = suite
+                results.append(result)
+                print(f"{suite:<12} {result['name']:<40} {str(result['size']):<22} {result['best_s'] * 1000:10.2f} ms")
+        except Exception as e:
+            # Eksik bağımlılık (tesseract, model.p vb.) diğer ölçümleri engellemesin
+            skipped[suite] = f"{type(e).__name__}: {e}"
+            print(f"{suite:<12} atlandı: {skipped[suite]}")
+
+    return {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Görüntü işleme ve analiz sıcak yolları için performans ölçümü")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--spots", type=int, nargs='+', default=[100, 380, 1000, 4000])
+    parser.add_argument("--records", type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.spots, args.records, args.repeats)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Sonuçlar {args.output} dosyasına yazıldı")
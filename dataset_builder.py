@@ -0,0 +1,96 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+
+import numpy as np
+
+
+FEATURE_SIZE = 15 * 15 * 3
+
+
+def load_crop(img_path):
+    """Eğitim kırpıntısını model_egitim.py ile aynı şekilde 15x15 boyutuna getirip düzleştirir."""
+    from skimage.io import imread
+    from skimage.transform import resize
+
+    return resize(imread(img_path), (15, 15)).astype(np.float32).ravel()
+
+
+def list_images(input_dir, categories):
+    """(göreli yol, etiket, mtime_ns, boyut) listesini kararlı bir sırada döndürür."""
+    entries = []
+    for category_idx, category in enumerate(categories):
+        for file in sorted(os.listdir(os.path.join(input_dir, category))):
+            stat = os.stat(os.path.join(input_dir, category, file))
+            entries.append([f"{category}/{file}", category_idx, stat.st_mtime_ns, stat.st_size])
+    return entries
+
+
+def build_dataset(input_dir, categories=('empty', 'not_empty'), cache_dir=None, workers=None):
+    """Öznitelik matrisini ve etiketleri döndürür; sonuçlar mmap ile açılan .npy önbelleğinde tutulur.
+
+    Önbellek dosya listesi ve değişiklik zamanlarına göre anahtarlanır: yalnızca yeni ya da değişen
+    görüntüler işlem havuzunda okunur, diğer satırlar eski önbellekten kopyalanır.
+    """
+    cache_dir = cache_dir or os.path.join(input_dir, '.cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    features_path = os.path.join(cache_dir, 'features.npy')
+    labels_path = os.path.join(cache_dir, 'labels.npy')
+
+    entries = list_images(input_dir, categories)
+
+    old_entries, old_features = [], None
+    if os.path.exists(manifest_path) and os.path.exists(features_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            old_entries = json.load(f)
+        old_features = np.load(features_path, mmap_mode='r')
+        if len(old_entries) != len(old_features):
+            old_entries, old_features = [], None
+
+    # labels.npy eksikse satırlar yine eskisinden kopyalanır, üç dosya birlikte yeniden yazılır
+    if entries == old_entries and os.path.exists(labels_path):
+        return old_features, np.load(labels_path)
+
+    # Değişmemiş dosyaların eski satırları yeniden kullanılır
+    old_rows = {tuple(entry): row for row, entry in enumerate(old_entries)}
+    reused = [(row, old_rows[tuple(entry)]) for row, entry in enumerate(entries) if tuple(entry) in old_rows]
+    missing = [row for row, entry in enumerate(entries) if tuple(entry) not in old_rows]
+
+    tmp_path = features_path + '.tmp.npy'
+    features = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32,
+                                         shape=(len(entries), FEATURE_SIZE))
+    if reused:
+        new_rows, old_rows_idx = map(np.asarray, zip(*reused))
+        features[new_rows] = old_features[old_rows_idx]
+
+    if missing:
+        paths = [os.path.join(input_dir, entries[row][0]) for row in missing]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for row, feature in zip(missing, pool.map(load_crop, paths, chunksize=64)):
+                features[row] = feature
+    print(f"{len(entries)} görüntü: {len(reused)} önbellekten, {len(missing)} yeniden okundu")
+
+    features.flush()
+    del features, old_features
+
+    # Manifest geçerli önbelleğin işaretidir: önce silinir, en son atomik olarak yazılır.
+    # Arada kesilen bir çalışma eski manifestle yeni öznitelik satırlarını eşleştiremez.
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    os.replace(tmp_path, features_path)
+    labels_tmp_path = labels_path + '.tmp.npy'
+    np.save(labels_tmp_path, np.asarray([entry[1] for entry in entries], dtype=np.int64))
+    os.replace(labels_tmp_path, labels_path)
+    manifest_tmp_path = manifest_path + '.tmp'
+    with open(manifest_tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f)
+    os.replace(manifest_tmp_path, manifest_path)
+
+    return np.load(features_path, mmap_mode='r'), np.load(labels_path)
+
+
+if __name__ == "__main__":
+    data, labels = build_dataset(sys.argv[1] if len(sys.argv) > 1 else 'clf-data')
+    print(f"Öznitelik matrisi: {data.shape}, etiketler: {np.bincount(labels)}")
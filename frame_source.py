@@ -0,0 +1,88 @@
+import queue
+import threading
+
+import cv2
+
+
+class FrameReader:
+    """Video karelerini ayrı bir iş parçacığında çözer ve sınırlı bir kuyruğa yazar.
+
+    stride > 1 ise aradaki kareler yalnızca cap.grab() ile atlanır; çözme ve renk dönüşümü yapılmaz.
+    interval (saniye) verilirse stride videonun fps değerinden hesaplanır.
+    """
+
+    def __init__(self, source, queue_size=4, stride=1, interval=None, loop=False):
+        self.source = source
+        self.loop = loop
+        self.cap = cv2.VideoCapture(source)
+
+        if interval is not None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+            stride = max(1, round(fps * interval))
+        self.stride = max(1, int(stride))
+
+        self.frames = queue.Queue(maxsize=queue_size)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _rewind(self):
+        # Döngü bitince yeniden başa sar; kaynak açılamıyorsa dur
+        if not self.loop or not self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            return False
+        return True
+
+    def _put(self, item):
+        # Kuyruk doluysa tüketiciyi bekle, ama durdurma isteğini kaçırma
+        while not self._stopped.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        index = 0
+        rewound = False
+        while not self._stopped.is_set():
+            skipped = 0
+            while skipped < self.stride - 1 and self.cap.grab():
+                skipped += 1
+            index += skipped
+
+            ret, frame = self.cap.read()
+            if not ret:
+                # Başa sardıktan hemen sonra da okunamıyorsa kaynak boş ya da bozuk
+                if not rewound and self._rewind():
+                    rewound = True
+                    continue
+                break
+            rewound = False
+
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if not self._put((index, timestamp, frame)):
+                break
+            index += 1
+
+        self.cap.release()
+        # Akış sonu işareti
+        self._put(None)
+
+    def read(self, timeout=None):
+        """(kare indeksi, zaman damgası, kare) döndürür; akış bittiyse None."""
+        return self.frames.get(timeout=timeout)
+
+    def __iter__(self):
+        while True:
+            item = self.read()
+            if item is None:
+                return
+            yield item
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join(timeout=1.0)
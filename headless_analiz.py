@@ -0,0 +1,95 @@
+import argparse
+import time
+
+import numpy as np
+
+from frame_source import FrameReader
+from model_registry import set_model_path
+from occupancy import OccupancyAnalyzer
+from occupancy_events import OccupancyEventStream
+from spot_layout import load_spot_layout, RegionOfInterest
+
+
+def analyze_video(video_path, mask_path, output_path, max_frames=None, stride=1, interval=None, polygons=False,
+                  scale=1.0, events_path=None):
+    """Videoyu arayüz olmadan olabildiğince hızlı işler ve kare bazlı doluluk serisini .npz olarak yazar."""
+    # Kareler park alanlarını kapsayan bölgeye kırpılır ve isteğe bağlı olarak küçültülür
+    roi = RegionOfInterest(load_spot_layout(mask_path), scale=scale)
+    spots = roi.spots
+
+    # Zaman bütçesi yok: her karede değişen tüm alanlar sınıflandırılır
+    analyzer = OccupancyAnalyzer(spots, frame_budget=None, polygons=roi.polygons if polygons else None)
+    events = OccupancyEventStream(len(spots), log_path=events_path) if events_path else None
+
+    frame_indices = []
+    timestamps = []
+    empty_counts = []
+    bitmasks = []
+
+    start = time.perf_counter()
+    reader = FrameReader(video_path, stride=stride, interval=interval).start()
+    for frame_index, timestamp, frame in reader:
+        status = analyzer.update(roi.apply(frame))
+        if events is not None:
+            events.update(status, analyzer.margins, timestamp, known=analyzer.classified)
+
+        frame_indices.append(frame_index)
+        timestamps.append(timestamp)
+        empty_counts.append(analyzer.empty_count)
+        # Alan başına 1 bit: 1 = boş
+        bitmasks.append(np.packbits(status))
+
+        if max_frames is not None and len(frame_indices) >= max_frames:
+            break
+
+    reader.stop()
+    if events is not None:
+        events.close()
+    elapsed = time.perf_counter() - start
+    processed = len(frame_indices)
+
+    np.savez_compressed(
+        output_path,
+        frame=np.asarray(frame_indices, dtype=np.int32),
+        timestamp=np.asarray(timestamps, dtype=np.float64),
+        empty=np.asarray(empty_counts, dtype=np.int32),
+        bitmask=np.asarray(bitmasks, dtype=np.uint8).reshape(processed, (len(spots) + 7) // 8),
+        spot_count=np.array(len(spots)),
+    )
+
+    fps = processed / elapsed if elapsed > 0 else 0.0
+    print(f"{processed} kare {elapsed:.2f} saniyede işlendi ({fps:.1f} fps), {len(spots)} park alanı")
+
+    return fps
+
+
+def load_occupancy(path):
+    """analyze_video çıktısını okur; bitmask (kare, alan) boyutunda bool dizisine açılır."""
+    with np.load(path) as data:
+        series = {key: data[key] for key in data.files}
+
+    spot_count = int(series['spot_count'])
+    series['status'] = np.unpackbits(series['bitmask'], axis=1, count=spot_count).astype(bool)
+
+    return series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arayüzsüz otopark doluluk analizi")
+    parser.add_argument("video")
+    parser.add_argument("--mask", default="mask_1920_1080.png")
+    parser.add_argument("--model", help="model.p / .joblib / .npz yolu")
+    parser.add_argument("--output", default="occupancy.npz")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--stride", type=int, default=1, help="her N karede bir analiz et")
+    parser.add_argument("--interval", type=float, help="analizler arası süre (saniye), stride yerine")
+    parser.add_argument("--scale", type=float, default=1.0, help="kırpılan bölgenin küçültme katsayısı")
+    parser.add_argument("--events", help="durum değişikliklerinin yazılacağı olay günlüğü (.csv)")
+    parser.add_argument("--polygons", action="store_true", help="açılı alanları perspektif düzeltmesiyle sınıflandır")
+    args = parser.parse_args()
+
+    if args.model:
+        set_model_path(args.model)
+
+    analyze_video(args.video, args.mask, args.output, args.max_frames, args.stride, args.interval, args.polygons,
+                  args.scale, args.events)
@@ -0,0 +1,125 @@
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+
+from frame_source import FrameReader
+from model_registry import set_model_path
+from occupancy import OccupancyAnalyzer
+from spot_layout import load_spot_layout, RegionOfInterest
+
+
+def load_lot_config(path):
+    """Otopark yapılandırma dosyasını okur; göreli yollar dosyanın klasörüne göre çözülür.
+
+    Biçim: {"lots": [{"name": "A", "video": "...", "mask": "...", "model": "model.p"}, ...]}
+    İsteğe bağlı alanlar: "stride" / "interval" (kare atlama), "loop" (video bitince başa sar),
+    "polygons" (açılı alanlar için perspektif düzeltmesi), "scale" (kırpılan bölgenin küçültme katsayısı).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    lots = []
+    for lot in config['lots']:
+        lot = dict(lot)
+        for key in ('video', 'mask', 'model'):
+            # Kamera adresleri (rtsp:// vb.) ve mutlak yollar olduğu gibi kalır
+            if lot.get(key) and '://' not in lot[key]:
+                lot[key] = os.path.join(base_dir, lot[key])
+        lots.append(lot)
+
+    return lots
+
+
+def run_lot(lot, results, stop_event, publish_interval=1.0):
+    """Bir otoparkın analiz döngüsünü ayrı bir işlemde çalıştırır ve doluluğu kuyruğa yazar."""
+    if lot.get('model'):
+        set_model_path(lot['model'])
+
+    roi = RegionOfInterest(load_spot_layout(lot['mask']), scale=lot.get('scale', 1.0))
+    spots = roi.spots
+    analyzer = OccupancyAnalyzer(spots, polygons=roi.polygons if lot.get('polygons') else None)
+
+    reader = FrameReader(lot['video'], stride=lot.get('stride', 1), interval=lot.get('interval'),
+                         loop=lot.get('loop', True)).start()
+
+    last_publish = 0.0
+    for frame_index, _, frame in reader:
+        if stop_event.is_set():
+            break
+
+        status = analyzer.update(roi.apply(frame))
+
+        now = time.time()
+        if now - last_publish >= publish_interval:
+            results.put({
+                'name': lot['name'],
+                'timestamp': now,
+                'frame': frame_index,
+                'empty': int(status.sum()),
+                'total': len(spots),
+            })
+            last_publish = now
+
+    reader.stop()
+
+
+class LotSupervisor:
+    """Her otopark için ayrı bir analiz işlemi başlatır ve doluluk bilgilerini toplar."""
+
+    def __init__(self, lots, publish_interval=1.0):
+        self.lots = lots
+        self.publish_interval = publish_interval
+        self.occupancy = {}
+
+        self.results = mp.Queue()
+        self.stop_event = mp.Event()
+        self.workers = []
+
+    def start(self):
+        for lot in self.lots:
+            worker = mp.Process(target=run_lot, name=f"otopark-{lot['name']}",
+                                args=(lot, self.results, self.stop_event, self.publish_interval),
+                                daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def poll(self, timeout=0.0):
+        """Kuyruktaki tüm güncellemeleri okur ve son doluluk tablosunu döndürür."""
+        try:
+            update = self.results.get(timeout=timeout) if timeout else self.results.get_nowait()
+            while True:
+                self.occupancy[update['name']] = update
+                update = self.results.get_nowait()
+        except queue.Empty:
+            pass
+
+        return self.occupancy
+
+    def totals(self):
+        """Tüm otoparkların toplam boş ve toplam alan sayısını döndürür."""
+        empty = sum(update['empty'] for update in self.occupancy.values())
+        total = sum(update['total'] for update in self.occupancy.values())
+        return empty, total
+
+    def stop(self):
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout=5)
+
+
+if __name__ == "__main__":
+    supervisor = LotSupervisor(load_lot_config(sys.argv[1] if len(sys.argv) > 1 else 'lots.json'))
+    supervisor.start()
+
+    try:
+        while True:
+            for name, update in sorted(supervisor.poll(timeout=1.0).items()):
+                print(f"{name}: {update['empty']}/{update['total']} boş (kare {update['frame']})")
+            empty, total = supervisor.totals()
+            print(f"Toplam: {empty}/{total} boş")
+    except KeyboardInterrupt:
+        supervisor.stop()
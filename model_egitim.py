@@ -1,51 +1,118 @@
-import os
+import argparse
+import csv
 import pickle
 
-from skimage.io import imread
-from skimage.transform import resize
-import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.model_selection import train_test_split
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV
 from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score
 
+from dataset_builder import build_dataset
+from svm_engine import CompiledSVC, verify_equivalence
 
-# prepare data
-input_dir = '/home/phillip/Desktop/todays_tutorial/19_parking_car_counter/code/clf-data'
-categories = ['empty', 'not_empty']
 
-data = []
-labels = []
-for category_idx, category in enumerate(categories):
-    for file in os.listdir(os.path.join(input_dir, category)):
-        img_path = os.path.join(input_dir, category, file)
-        img = imread(img_path)
-        img = resize(img, (15, 15))
-        data.append(img.flatten())
-        labels.append(category_idx)
+def write_search_report(search, path, cv, n_samples):
+    """Write fit time, predict latency per 1000 spots and accuracy of every candidate to a CSV file."""
+    results = search.cv_results_
+    n_candidates = len(results['params'])
+    # halving search trains each iteration on a different number of samples
+    n_resources = results['n_resources'] if 'n_resources' in results else [n_samples] * n_candidates
+    iterations = results['iter'] if 'iter' in results else [0] * n_candidates
 
-data = np.asarray(data)
-labels = np.asarray(labels)
+    rows = []
+    for idx in range(n_candidates):
+        # each CV split scores on n_resources / cv samples
+        test_size = max(n_resources[idx] // cv, 1)
+        rows.append({
+            'iter': int(iterations[idx]),
+            'C': results['params'][idx]['C'],
+            'gamma': results['params'][idx]['gamma'],
+            'n_samples': int(n_resources[idx]),
+            'fit_time_s': round(float(results['mean_fit_time'][idx]), 4),
+            'predict_ms_per_1000': round(float(results['mean_score_time'][idx]) * 1000 * 1000 / test_size, 3),
+            'accuracy': round(float(results['mean_test_score'][idx]), 4),
+        })
+    rows.sort(key=lambda row: (-row['iter'], -row['accuracy'], row['predict_ms_per_1000']))
 
-# train / test split
-x_train, x_test, y_train, y_test = train_test_split(data, labels, test_size=0.2, shuffle=True, stratify=labels)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
 
-# train classifier
-classifier = SVC()
+    return rows
 
-parameters = [{'gamma': [0.01, 0.001, 0.0001], 'C': [1, 10, 100, 1000]}]
 
-grid_search = GridSearchCV(classifier, parameters)
+def select_candidate(rows, max_latency_ms):
+    """Pick the most accurate candidate of the last search iteration within the latency budget."""
+    last_iter = max(row['iter'] for row in rows)
+    candidates = [row for row in rows if row['iter'] == last_iter and row['predict_ms_per_1000'] <= max_latency_ms]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda row: row['accuracy'])
 
-grid_search.fit(x_train, y_train)
 
-# test performance
-best_estimator = grid_search.best_estimator_
+def main():
+    parser = argparse.ArgumentParser(description='Train the parking spot classifier')
+    parser.add_argument('--fast', action='store_true',
+                        help='parallel successive-halving search instead of the full grid search')
+    parser.add_argument('--report', default='./search_report.csv')
+    parser.add_argument('--max-latency-ms', type=float,
+                        help='choose the most accurate model predicting 1000 spots within this many ms')
+    args = parser.parse_args()
 
-y_prediction = best_estimator.predict(x_test)
+    # prepare data (decoded in parallel, cached as memory-mapped .npy next to the images)
+    input_dir = '/home/phillip/Desktop/todays_tutorial/19_parking_car_counter/code/clf-data'
+    categories = ['empty', 'not_empty']
 
-score = accuracy_score(y_prediction, y_test)
+    data, labels = build_dataset(input_dir, categories)
 
-print('{}% of samples were correctly classified'.format(str(score * 100)))
+    # train / test split
+    x_train, x_test, y_train, y_test = train_test_split(data, labels, test_size=0.2, shuffle=True, stratify=labels)
 
-pickle.dump(best_estimator, open('./model.p', 'wb'))
+    # train classifier
+    parameters = [{'gamma': [0.01, 0.001, 0.0001], 'C': [1, 10, 100, 1000]}]
+    cv = 5
+
+    if args.fast:
+        # larger libsvm kernel cache, all cores, bad candidates dropped on small subsets first
+        classifier = SVC(cache_size=1000)
+        grid_search = HalvingGridSearchCV(classifier, parameters, cv=cv, factor=3, n_jobs=-1)
+    else:
+        classifier = SVC()
+        grid_search = GridSearchCV(classifier, parameters, cv=cv)
+
+    grid_search.fit(x_train, y_train)
+
+    rows = write_search_report(grid_search, args.report, cv, len(x_train))
+    print('search report written to {}'.format(args.report))
+
+    # test performance
+    best_estimator = grid_search.best_estimator_
+
+    if args.max_latency_ms is not None:
+        selected = select_candidate(rows, args.max_latency_ms)
+        if selected is None:
+            print('no candidate predicts within {} ms per 1000 spots, keeping the most accurate one'.format(
+                args.max_latency_ms))
+        else:
+            best_estimator = SVC(C=selected['C'], gamma=selected['gamma']).fit(x_train, y_train)
+
+    y_prediction = best_estimator.predict(x_test)
+
+    score = accuracy_score(y_prediction, y_test)
+
+    print('{}% of samples were correctly classified'.format(str(score * 100)))
+
+    pickle.dump(best_estimator, open('./model.p', 'wb'))
+
+    # compile the NumPy inference engine, check it against the SVC on the training crops and only then write it
+    compiled = CompiledSVC.from_sklearn(best_estimator)
+    mismatches = verify_equivalence(best_estimator, compiled, data)
+    if mismatches:
+        raise SystemExit('compiled model disagrees with the SVC on {} samples, model.npz not written'.format(mismatches))
+    compiled.save('./model.npz')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import os
+import pickle
+import sys
+import threading
+
+
+# Model yolu sırasıyla: set_model_path(), OTOPARK_MODEL_PATH ortam değişkeni, proje klasöründeki model.p
+MODEL_PATH_ENV = "OTOPARK_MODEL_PATH"
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model.p")
+
+_models = {}
+_model_path = None
+_lock = threading.Lock()
+
+
+def set_model_path(path):
+    """Varsayılan model yolunu değiştirir; önceden yüklenmiş modeller önbellekte kalır."""
+    global _model_path
+    _model_path = path
+
+
+def resolve_model_path(path=None):
+    return os.path.abspath(path or _model_path or os.environ.get(MODEL_PATH_ENV) or DEFAULT_MODEL_PATH)
+
+
+def load_model(path):
+    """Modeli uzantısına göre yükler; .joblib dosyaları mmap ile açılır, .npz derlenmiş SVC'dir."""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".npz":
+        from svm_engine import CompiledSVC
+
+        return CompiledSVC.load(path)
+
+    if extension == ".joblib":
+        import joblib
+
+        # Destek vektörü dizileri salt okunur mmap olarak açılır, işlemler arasında paylaşılır
+        return joblib.load(path, mmap_mode="r")
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def get_model(path=None):
+    """Modeli ilk kullanımda yükler ve işlem boyunca önbellekte tutar."""
+    path = resolve_model_path(path)
+
+    model = _models.get(path)
+    if model is None:
+        with _lock:
+            model = _models.get(path)
+            if model is None:
+                model = _models[path] = load_model(path)
+
+    return model
+
+
+def convert_to_joblib(src, dst=None):
+    """pickle modelini mmap ile açılabilen sıkıştırılmamış joblib dosyasına çevirir."""
+    import joblib
+
+    dst = dst or os.path.splitext(src)[0] + ".joblib"
+    with open(src, "rb") as f:
+        model = pickle.load(f)
+
+    # mmap yalnızca sıkıştırılmamış dosyalarda çalışır
+    joblib.dump(model, dst, compress=0)
+
+    return dst
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"Model kaydedildi: {convert_to_joblib(source, target)}")
@@ -0,0 +1,51 @@
+import numpy as np
+
+from util import classify_features, empty_or_not_batch, SpotChangeDetector, SpotFeatureExtractor, SpotRectifier
+from spot_scheduler import SpotScheduler
+
+
+class OccupancyAnalyzer:
+    """Tek bir otoparkın kareler arası doluluk durumunu tutar; arayüzden bağımsızdır."""
+
+    def __init__(self, spots, frame_budget=0.02, change_threshold=8.0, polygons=None):
+        self.spots = spots
+        self.status = np.zeros(len(spots), dtype=bool)
+        # Son sınıflandırmanın karar marjı; NaN = henüz sınıflandırılmadı
+        self.margins = np.full(len(spots), np.nan, dtype=np.float32)
+        # En az bir kez sınıflandırılan alanlar; bütçeli ilk karelerde bir kısmı henüz bilinmez
+        self.classified = np.zeros(len(spots), dtype=bool)
+
+        self.change_detector = SpotChangeDetector(spots, threshold=change_threshold)
+        # Çokgenler verilirse alanlar perspektif düzeltmesiyle, yoksa bbox kırpıntılarıyla sınıflandırılır
+        self.rectified = polygons is not None
+        if self.rectified:
+            self.feature_extractor = SpotRectifier(polygons)
+        else:
+            self.feature_extractor = SpotFeatureExtractor(spots)
+        self.scheduler = SpotScheduler(len(spots), frame_budget=frame_budget)
+
+    @property
+    def empty_count(self):
+        return int(np.count_nonzero(self.status))
+
+    def update(self, frame):
+        """Yalnızca görüntüsü değişen park alanlarını, kare bütçesine sığdığı kadar yeniden sınıflandırır."""
+        signatures = self.change_detector.signatures(frame)
+        # Çokgen düzeltmesi karede en fazla bir kez, ilk grup sınıflandırılırken yapılır.
+        # Önbellek nesne kimliğine bağlanmaz: ROI küçültmesi her karede aynı tamponu döndürür.
+        features = []
+
+        def classify(indices):
+            if self.rectified:
+                if not features:
+                    features.append(self.feature_extractor.rectify(frame))
+                result = classify_features(features[0][indices], return_margin=True)
+            else:
+                result = empty_or_not_batch(frame, self.feature_extractor, indices, return_margin=True)
+            self.status[indices], self.margins[indices] = result
+            self.classified[indices] = True
+            self.change_detector.commit(indices, signatures)
+
+        self.scheduler.run(self.change_detector.changed(signatures), classify)
+
+        return self.status
@@ -0,0 +1,99 @@
+from collections import namedtuple
+import os
+import time
+
+import numpy as np
+
+
+# old / new: True = boş, False = dolu, None = henüz bilinmiyor
+OccupancyEvent = namedtuple('OccupancyEvent', ['spot_id', 'timestamp', 'old', 'new', 'margin'])
+
+
+def _state(value):
+    return '' if value is None else int(value)
+
+
+class OccupancyEventStream:
+    """Doluluk durumunu tam anlık görüntü yerine yalnızca değişiklik olayları olarak yayınlar.
+
+    Boş alan sayısı artımlı tutulur; olaylar isteğe bağlı olarak yalnızca eklemeli bir CSV dosyasına yazılır
+    ve abonelere (arayüz, MQTT, empty_slots.txt, analiz) iletilir.
+    """
+
+    def __init__(self, spot_count, log_path=None):
+        self.status = np.zeros(spot_count, dtype=bool)
+        # Henüz sınıflandırılmamış alanlar olay üretmez ve sayılmaz
+        self.known = np.zeros(spot_count, dtype=bool)
+        self.empty_count = 0
+        self.total = spot_count
+        self.subscribers = []
+
+        self.log = None
+        if log_path:
+            is_new = not os.path.exists(log_path)
+            self.log = open(log_path, 'a', encoding='utf-8')
+            if is_new:
+                self.log.write("Timestamp,Spot,Old,New,Margin\n")
+
+    def subscribe(self, callback):
+        """callback(events, stream) her değişiklik kümesinde çağrılır."""
+        self.subscribers.append(callback)
+        return callback
+
+    def update(self, status, margins=None, timestamp=None, known=None):
+        """Yeni durum dizisini öncekiyle karşılaştırır, yalnızca değişen alanlar için olay üretir.
+
+        known, en az bir kez sınıflandırılmış alanların maskesidir (OccupancyAnalyzer.classified);
+        verilmezse tüm alanlar bilinir kabul edilir.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        status = np.asarray(status, dtype=bool)
+        known = np.ones(len(status), dtype=bool) if known is None else np.asarray(known, dtype=bool)
+
+        # İlk kez bilinen alanlar "bilinmiyor"dan geçiş olarak yayınlanır
+        changed = np.flatnonzero(known & (~self.known | (status != self.status)))
+        if len(changed) == 0:
+            return []
+
+        new_states = status[changed]
+        was_known = self.known[changed]
+        self.empty_count += int(np.count_nonzero(new_states)) - int(np.count_nonzero(self.status[changed] & was_known))
+
+        events = [
+            OccupancyEvent(int(idx) + 1, timestamp, bool(self.status[idx]) if self.known[idx] else None,
+                           bool(status[idx]), None if margins is None else float(margins[idx]))
+            for idx in changed
+        ]
+        self.status[changed] = new_states
+        self.known[changed] = True
+
+        if self.log is not None:
+            self.log.writelines(
+                f"{event.timestamp:.3f},{event.spot_id},{_state(event.old)},{_state(event.new)},"
+                f"{'' if event.margin is None else f'{event.margin:.4f}'}\n"
+                for event in events
+            )
+            self.log.flush()
+
+        for callback in self.subscribers:
+            callback(events, self)
+
+        return events
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+class EmptySlotsExporter:
+    """empty_slots.txt dosyasını yalnızca doluluk değiştiğinde yeniden yazan abone."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, events, stream):
+        empty_spots = np.flatnonzero(stream.status) + 1
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("Empty Spots:\n")
+            f.writelines(f"{spot}\n" for spot in empty_spots)
@@ -0,0 +1,165 @@
+import os
+import queue
+import threading
+import warnings
+
+import cv2
+import numpy as np
+
+
+# Yol ayarları: ortam değişkenleri, yoksa Windows'ta varsayılan kurulum klasörü, diğer sistemlerde PATH
+TESSDATA_ENV = "TESSDATA_PREFIX"
+TESSERACT_CMD_ENV = "TESSERACT_CMD"
+WINDOWS_TESSERACT_DIR = r"C:\Program Files\Tesseract-OCR"
+
+
+def default_tessdata():
+    if os.environ.get(TESSDATA_ENV):
+        return os.environ[TESSDATA_ENV]
+    if os.name == 'nt':
+        return os.path.join(WINDOWS_TESSERACT_DIR, 'tessdata')
+    return None
+
+
+def default_tesseract_cmd():
+    if os.environ.get(TESSERACT_CMD_ENV):
+        return os.environ[TESSERACT_CMD_ENV]
+    if os.name == 'nt':
+        return os.path.join(WINDOWS_TESSERACT_DIR, 'tesseract.exe')
+    return None
+
+
+class OcrEngine:
+    """Tesseract örneklerini süreç boyunca açık tutan OCR motoru.
+
+    Gerekli arka uç tesserocr'dır (pip install tesserocr): dil verisi bir kez yüklenir ve her çağrı aynı
+    süreç içinde çalışır; örnekler iş parçacığı güvenli olmadığından pool_size kadar örnek bir kuyrukta
+    paylaşılır. tesserocr yoksa her çağrıda yeni bir tesseract süreci başlatan pytesseract'a geri düşülür
+    ve bu bir kez uyarı olarak bildirilir.
+    """
+
+    def __init__(self, lang='eng', psm=8, pool_size=1, tessdata=None, tesseract_cmd=None):
+        self.lang = lang
+        self.psm = psm
+        self.tessdata = tessdata or default_tessdata()
+        self.tesseract_cmd = tesseract_cmd or default_tesseract_cmd()
+
+        self._apis = queue.Queue()
+        try:
+            from tesserocr import PyTessBaseAPI
+
+            for _ in range(max(pool_size, 1)):
+                kwargs = {'lang': lang, 'psm': psm}
+                if self.tessdata:
+                    kwargs['path'] = self.tessdata
+                self._apis.put(PyTessBaseAPI(**kwargs))
+            self.backend = 'tesserocr'
+        except ImportError:
+            import pytesseract
+
+            warnings.warn("tesserocr bulunamadı, pytesseract kullanılıyor: her OCR çağrısı yeni bir tesseract "
+                          "süreci başlatır. Süreç içi OCR için 'pip install tesserocr' kurun.",
+                          RuntimeWarning, stacklevel=2)
+
+            if self.tessdata:
+                os.environ[TESSDATA_ENV] = self.tessdata
+            if self.tesseract_cmd:
+                pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+            self.backend = 'pytesseract'
+
+    def recognize(self, image):
+        """Gri / ikili (uint8) görüntüdeki metni döndürür."""
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+
+        if self.backend == 'pytesseract':
+            import pytesseract
+
+            return pytesseract.image_to_string(image, lang=self.lang, config=f"--psm {self.psm}")
+
+        api = self._apis.get()
+        try:
+            height, width = image.shape[:2]
+            channels = 1 if image.ndim == 2 else image.shape[2]
+            api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            return api.GetUTF8Text()
+        finally:
+            self._apis.put(api)
+
+    def _recognize_words(self, image, psm):
+        """Görüntüdeki kelimeleri (metin, (x1, y1, x2, y2)) listesi olarak döndürür."""
+        if self.backend == 'pytesseract':
+            import pytesseract
+
+            data = pytesseract.image_to_data(image, lang=self.lang, config=f"--psm {psm}",
+                                             output_type=pytesseract.Output.DICT)
+            return [
+                (text, (left, top, left + width, top + height))
+                for text, left, top, width, height in zip(data['text'], data['left'], data['top'],
+                                                           data['width'], data['height'])
+                if text.strip()
+            ]
+
+        from tesserocr import RIL, iterate_level
+
+        api = self._apis.get()
+        try:
+            api.SetPageSegMode(psm)
+            api.SetImageBytes(image.tobytes(), image.shape[1], image.shape[0], 1, image.shape[1])
+            api.Recognize()
+            words = []
+            for word in iterate_level(api.GetIterator(), RIL.WORD):
+                text = word.GetUTF8Text(RIL.WORD)
+                if text and text.strip():
+                    words.append((text, word.BoundingBox(RIL.WORD)))
+            return words
+        finally:
+            api.SetPageSegMode(self.psm)
+            self._apis.put(api)
+
+    def recognize_batch(self, images, height=40, gap=16):
+        """Görüntüleri ortak yüksekliğe getirip alt alta tek görüntüde tek çağrıyla tanır.
+
+        Kelimeler dikey konumlarına göre geldikleri görüntüye atanır; görüntü başına bir metin döndürülür.
+        """
+        if not images:
+            return []
+
+        resized = []
+        for image in images:
+            width = max(int(round(image.shape[1] * height / image.shape[0])), 1)
+            interpolation = cv2.INTER_AREA if image.shape[0] > height else cv2.INTER_CUBIC
+            resized.append(cv2.resize(image, (width, height), interpolation=interpolation))
+
+        # Beyaz zemin üzerinde aralıklı şeritler
+        stripe = height + gap
+        canvas = np.full((gap + stripe * len(resized), max(img.shape[1] for img in resized) + 2 * gap), 255,
+                         dtype=np.uint8)
+        for idx, image in enumerate(resized):
+            top = gap + idx * stripe
+            canvas[top:top + height, gap:gap + image.shape[1]] = image
+
+        lines = [[] for _ in images]
+        for text, (x1, y1, x2, y2) in self._recognize_words(canvas, psm=6):
+            idx = int(((y1 + y2) / 2 - gap / 2) // stripe)
+            if 0 <= idx < len(lines):
+                lines[idx].append((x1, text))
+
+        return [' '.join(text for _, text in sorted(words)) for words in lines]
+
+    def close(self):
+        while not self._apis.empty():
+            self._apis.get_nowait().End()
+
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def get_engine(lang='eng', psm=8, pool_size=1):
+    """Süreç başına (dil, psm, havuz boyutu) için tek bir OCR motoru oluşturur ve önbellekte tutar."""
+    key = (lang, psm, pool_size)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = OcrEngine(lang=lang, psm=psm, pool_size=pool_size)
+    return engine
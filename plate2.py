@@ -1,18 +1,27 @@
 import cv2
-import pytesseract
 import os
 from datetime import datetime
 import time  # Zaman ölçümü için ekledik
 
-# Tesseract ortam değişkeni
-os.environ["TESSDATA_PREFIX"] = r"C:\Program Files\Tesseract-OCR\tessdata"
+from ocr_engine import get_engine
+from plate_engine import PlateEngine
+from plate_stream import EntryMotionGate
+from plate_tracker import PlateTracker
 
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+# Tesseract bir kez başlatılır ve açık tutulur (yollar: TESSDATA_PREFIX / TESSERACT_CMD ortam değişkenleri)
+ocr = get_engine(psm=8)
+# Adaylar 960 piksel genişliğe küçültülmüş karede aranır, yalnızca aday bölgeleri tam çözünürlükte işlenir
+plate_engine = PlateEngine(ocr, coarse_width=960)
+# Akışta karede yalnızca en olası aday izlenir; pencere, ızgara gibi adaylar ayrı araç kaydı oluşturmaz
+stream_engine = PlateEngine(ocr, coarse_width=960, max_candidates=1)
 
 # Kaynak dosya (.mp4 veya .jpg)
 input_source = "C:\\Users\\altay\\Desktop\\Master's Degree\\Bitirme Tezi Kodlar\\otoparkalgi\\parking-space-counter-master\\2.jpg"
 database_file = "C:\\Users\\altay\\Desktop\\Master's Degree\\Bitirme Tezi Kodlar\\otoparkalgi\\parking-space-counter-master\\parking_data.txt"
 
+# Video / kamera akışında izlenen giriş bölgesi (x, y, w, h); None ise tüm kare
+entry_roi = None
+
 def save_plate_data(plate):
     plate = plate.strip()
     date = datetime.now().strftime("%Y-%m-%d")
@@ -31,41 +40,20 @@ def save_plate_data(plate):
         with open(database_file, 'a') as f:
             f.write(f"{plate},{date},{hour}\n")
 
-def process_frame(frame):
+def process_frame(frame, show=True):
     start_time = time.time()  # İşlem başlangıç zamanı
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    filter = cv2.bilateralFilter(gray, 11, 17, 17)
-    edges = cv2.Canny(filter, 170, 200)
-
-    contours, _ = cv2.findContours(edges.copy(), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:10]
+    reads = plate_engine.read(frame)
 
     found_plate = False
     plate_text = ""
 
-    for contour in contours:
-        perimeter = cv2.arcLength(contour, True)
-        epsilon = 0.018 * perimeter
-        approx = cv2.approxPolyDP(contour, epsilon, True)
-
-        if len(approx) == 4:
-            x, y, w, h = cv2.boundingRect(approx)
-            plate_img = frame[y:y+h, x:x+w]
-
-            plate_gray = cv2.cvtColor(plate_img, cv2.COLOR_BGR2GRAY)
-            _, plate_thresh = cv2.threshold(plate_gray, 150, 255, cv2.THRESH_BINARY)
-
-            plate_text = pytesseract.image_to_string(plate_thresh, config="--psm 8")
-            plate_text = plate_text.replace(" ", "").replace("\n", "")
-
-            if plate_text.strip():
-                print("Algılanan Plaka:", plate_text)
-                cv2.drawContours(frame, [approx], -1, (0, 255, 0), 3)
-                found_plate = True
-
-                if plate_text != "":
-                    save_plate_data(plate_text.strip())
-                break
+    # Okunan adaylar en olasıdan başlayarak sıralıdır
+    if reads:
+        plate_text = reads[0].text
+        print("Algılanan Plaka:", plate_text)
+        cv2.drawContours(frame, [reads[0].candidate.approx], -1, (0, 255, 0), 3)
+        found_plate = True
+        save_plate_data(plate_text)
 
     end_time = time.time()  # İşlem bitiş zamanı
     elapsed_time = end_time - start_time
@@ -74,21 +62,44 @@ def process_frame(frame):
         print(f"Plaka algılandı: {plate_text} - Süre: {elapsed_time:.2f} saniye")
     else:
         print(f"Plaka bulunamadı - Süre: {elapsed_time:.2f} saniye")
+    print(f"Aşamalar: {plate_engine.report()}")
 
-    cv2.imshow("Detected Plate", frame)
-    cv2.waitKey(0)
+    if show:
+        cv2.imshow("Detected Plate", frame)
+        cv2.waitKey(0)
+
+    return plate_text.strip() if found_plate else None
+
+def stream_plates(source):
+    """Giriş bölgesinde araç varken plakaları izler; her araç için tek kayıt yazar, görüntü göstermez."""
+    cap = cv2.VideoCapture(source)
+    gate = EntryMotionGate(roi=entry_roi)
+    # Aynı aracın ardışık karelerdeki okumaları tek izde toplanır ve oylanır
+    tracker = PlateTracker(ocr, on_plate=save_plate_data)
 
-# Dosya uzantısını kontrol et
-if input_source.lower().endswith('.mp4'):
-    cap = cv2.VideoCapture(input_source)
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
-        process_frame(frame)
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+
+        detections = []
+        if gate.update(frame):
+            candidates, plate_crops, gray_crops = stream_engine.detect(frame)
+            detections = [(candidate.bbox, plate_crop, gray_crop)
+                          for candidate, plate_crop, gray_crop in zip(candidates, plate_crops, gray_crops)]
+
+        # Boş karelerde de çağrılır; böylece bölgeden çıkan aracın izi kapanır
+        for track_id, plate in tracker.update(detections):
+            print(f"Araç {track_id} plakası: {plate}")
+
+    for track_id, plate in tracker.flush():
+        print(f"Araç {track_id} plakası: {plate}")
+
     cap.release()
+
+# Dosya uzantısını kontrol et
+if input_source.lower().endswith('.mp4') or '://' in input_source:
+    stream_plates(input_source)
 elif input_source.lower().endswith('.jpg'):
     frame = cv2.imread(input_source)
     if frame is not None:
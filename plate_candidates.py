@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+
+PlateCandidate = namedtuple('PlateCandidate', ['bbox', 'approx', 'score'])
+
+
+def containment(a, b):
+    """İki bbox'ın kesişim alanının küçük olanın alanına oranı (iç içe kutularda ~1)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(min(ax + aw, bx + bw) - max(ax, bx), 0)
+    ih = max(min(ay + ah, by + bh) - max(ay, by), 0)
+    smaller = min(aw * ah, bw * bh)
+    return iw * ih / smaller if smaller > 0 else 0.0
+
+
+def plate_candidates(contours, frame_shape, max_contours=30, epsilon_ratio=0.018, aspect_range=(2.0, 6.5),
+                     area_range=(0.0005, 0.25), min_rectangularity=0.6, ideal_aspect=4.5, max_overlap=0.7):
+    """Konturları plaka geometrisine göre puanlar; plaka olamayacakları OCR'dan önce eler.
+
+    Dört köşeye indirgenemeyen, en-boy oranı / alanı plaka aralığı dışında kalan ya da dikdörtgene
+    benzemeyen konturlar atılır. Kalanlar puana göre (en olası önce) sıralı döndürülür.
+    RETR_TREE aynı plaka çerçevesinin iç ve dış konturunu ayrı döndürür; daha yüksek puanlı bir adayla
+    max_overlap oranından fazla örtüşen adaylar elenir, böylece her plaka tek OCR şeridi tutar.
+    """
+    frame_area = float(frame_shape[0] * frame_shape[1])
+    candidates = []
+
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:max_contours]:
+        perimeter = cv2.arcLength(contour, True)
+        approx = cv2.approxPolyDP(contour, epsilon_ratio * perimeter, True)
+        if len(approx) != 4:
+            continue
+
+        x, y, w, h = cv2.boundingRect(approx)
+        if w == 0 or h == 0:
+            continue
+
+        aspect = w / h
+        area_ratio = (w * h) / frame_area
+        rectangularity = cv2.contourArea(approx) / (w * h)
+        if not (aspect_range[0] <= aspect <= aspect_range[1] and area_range[0] <= area_ratio <= area_range[1]
+                and rectangularity >= min_rectangularity):
+            continue
+
+        # Dikdörtgene yakınlık ve ideal plaka oranına (Türk plakası ~52x11 cm) yakınlık
+        score = rectangularity - 0.5 * abs(np.log(aspect / ideal_aspect))
+        candidates.append(PlateCandidate((x, y, w, h), approx, score))
+
+    candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+
+    kept = []
+    for candidate in candidates:
+        if all(containment(candidate.bbox, other.bbox) <= max_overlap for other in kept):
+            kept.append(candidate)
+    return kept
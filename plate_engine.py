@@ -0,0 +1,185 @@
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from ocr_engine import get_engine
+from plate_candidates import PlateCandidate, plate_candidates
+
+
+PlateRead = namedtuple('PlateRead', ['text', 'candidate', 'crop'])
+
+STAGES = ('preprocess', 'candidates', 'refine', 'binarize', 'ocr', 'postprocess')
+
+
+def normalize_plate(text):
+    """OCR çıktısından harf ve rakam dışındaki karakterleri atar."""
+    return ''.join(filter(str.isalnum, text))
+
+
+class PlateEngine:
+    """Plaka tanıma hattı: preprocess → candidates → binarize → ocr → postprocess.
+
+    Aşama parametreleri yapıcıdan ayarlanır; bir aşamanın tamamen değiştirilmesi için ilgili metot
+    alt sınıfta ezilebilir. Her çağrıda aşama süreleri ve sayaçlar kaydedilir (last_timings, stats()).
+
+    coarse_width verilirse adaylar bu genişliğe küçültülmüş görüntüde aranır; yalnızca aday bölgeleri
+    tam çözünürlükte yeniden bulunur (refine) ve OCR'a tam çözünürlüklü kırpıntılar gider.
+    """
+
+    def __init__(self, ocr=None, bilateral=(11, 17, 17), canny=(170, 200), threshold=150,
+                 max_candidates=None, postprocess=normalize_plate, coarse_width=None, refine_margin=0.25,
+                 **candidate_options):
+        self.ocr = ocr if ocr is not None else get_engine(psm=8)
+        self.bilateral = bilateral
+        self.canny = canny
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.postprocess_text = postprocess
+        self.coarse_width = coarse_width
+        self.refine_margin = refine_margin
+        # plate_candidates'e aktarılır (epsilon_ratio, aspect_range, area_range, ...)
+        self.candidate_options = candidate_options
+
+        self.last_timings = {}
+        self.last_counts = {}
+        self.reset_stats()
+
+    # Aşamalar
+
+    def edges(self, gray, scale=1.0):
+        d, sigma_color, sigma_space = self.bilateral
+        # Küçültülmüş görüntüde filtre komşuluğu da aynı oranda küçülür
+        filtered = cv2.bilateralFilter(gray, max(int(round(d * scale)), 3), sigma_color, sigma_space * scale)
+        return cv2.Canny(filtered, *self.canny)
+
+    def preprocess(self, frame):
+        """Tam çözünürlüklü gri görüntüyü, kenar haritasını ve kenar haritasının ölçeğini döndürür."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        scale = 1.0
+        small = gray
+        if self.coarse_width and gray.shape[1] > self.coarse_width:
+            scale = self.coarse_width / gray.shape[1]
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return gray, self.edges(small, scale), scale
+
+    def candidates(self, edges, frame_shape):
+        contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        candidates = plate_candidates(contours, frame_shape, **self.candidate_options)
+        return candidates[:self.max_candidates] if self.max_candidates else candidates
+
+    def refine(self, gray, coarse, scale):
+        """Küçük görüntüde bulunan adayları tam çözünürlükte, yalnızca aday bölgesinde yeniden arar."""
+        height, width = gray.shape[:2]
+        refined, seen = [], set()
+        for candidate in coarse:
+            x, y, w, h = candidate.bbox
+            margin_x, margin_y = w * self.refine_margin, h * self.refine_margin
+            x0, y0 = max(int((x - margin_x) / scale), 0), max(int((y - margin_y) / scale), 0)
+            x1 = min(int(np.ceil((x + w + margin_x) / scale)), width)
+            y1 = min(int(np.ceil((y + h + margin_y) / scale)), height)
+
+            # Alan oranları tüm kareye göre hesaplanır; bölge içinde en olası aday alınır
+            found = self.candidates(self.edges(gray[y0:y1, x0:x1]), gray.shape)
+            if found:
+                best = found[0]
+                bx, by, bw, bh = best.bbox
+                candidate = PlateCandidate((bx + x0, by + y0, bw, bh), best.approx + (x0, y0), best.score)
+            else:
+                # Tam çözünürlükte netleşmezse kaba aday ölçeklenerek kullanılır
+                approx = np.round(candidate.approx / scale).astype(np.int32)
+                candidate = PlateCandidate(cv2.boundingRect(approx), approx, candidate.score)
+
+            # İç içe kaba konturlar aynı plakaya daralabilir
+            if candidate.bbox not in seen:
+                seen.add(candidate.bbox)
+                refined.append(candidate)
+        return refined
+
+    def binarize(self, gray, candidates):
+        crops = []
+        for candidate in candidates:
+            x, y, w, h = candidate.bbox
+            _, plate_thresh = cv2.threshold(gray[y:y+h, x:x+w], self.threshold, 255, cv2.THRESH_BINARY)
+            crops.append(plate_thresh)
+        return crops
+
+    def recognize_crops(self, crops):
+        # Tüm adaylar tek OCR çağrısında okunur
+        return self.ocr.recognize_batch(crops) if crops else []
+
+    def postprocess(self, texts):
+        return [self.postprocess_text(text) for text in texts]
+
+    # Ölçüm
+
+    def _timed(self, stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+
+        self.last_timings[stage] = elapsed
+        total = self._stage_totals[stage]
+        total['calls'] += 1
+        total['total_s'] += elapsed
+        total['max_s'] = max(total['max_s'], elapsed)
+        return result
+
+    def _count(self, name, value):
+        self.last_counts[name] = value
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset_stats(self):
+        self._stage_totals = {stage: {'calls': 0, 'total_s': 0.0, 'max_s': 0.0} for stage in STAGES}
+        self._counters = {'frames': 0}
+
+    def stats(self):
+        """Birikmiş aşama sürelerini (toplam / ortalama / en kötü) ve sayaçları döndürür."""
+        stages = {}
+        for stage, total in self._stage_totals.items():
+            stages[stage] = dict(total, mean_s=total['total_s'] / total['calls'] if total['calls'] else 0.0)
+        return {'stages': stages, 'counters': dict(self._counters)}
+
+    def report(self):
+        """Son çağrının aşama sürelerini tek satırlık metin olarak döndürür."""
+        parts = [f"{stage} {self.last_timings[stage] * 1000:.1f} ms" for stage in STAGES if stage in self.last_timings]
+        parts += [f"{name}={value}" for name, value in self.last_counts.items()]
+        return ", ".join(parts)
+
+    # Giriş noktaları
+
+    def detect(self, frame):
+        """OCR yapmadan plaka adaylarını, ikili ve gri kırpıntılarıyla birlikte döndürür."""
+        self.last_timings = {}
+        self.last_counts = {}
+        self._count('frames', 1)
+
+        gray, edges, scale = self._timed('preprocess', self.preprocess, frame)
+        candidates = self._timed('candidates', self.candidates, edges, edges.shape)
+        if scale != 1.0:
+            self._count('coarse_candidates', len(candidates))
+            candidates = self._timed('refine', self.refine, gray, candidates, scale)
+        crops = self._timed('binarize', self.binarize, gray, candidates)
+        self._count('candidates', len(candidates))
+
+        gray_crops = [gray[y:y+h, x:x+w] for x, y, w, h in (candidate.bbox for candidate in candidates)]
+        return candidates, crops, gray_crops
+
+    def read(self, frame):
+        """Metni okunabilen tüm adayları en olası aday önce olacak şekilde PlateRead listesi olarak döndürür."""
+        candidates, crops, _ = self.detect(frame)
+
+        texts = self._timed('ocr', self.recognize_crops, crops)
+        self._count('ocr_crops', len(crops))
+        texts = self._timed('postprocess', self.postprocess, texts)
+
+        reads = [PlateRead(text, candidate, crop)
+                 for text, candidate, crop in zip(texts, candidates, crops) if text.strip()]
+        self._count('plates', len(reads))
+        return reads
+
+    def recognize(self, frame):
+        """En olası adayın okunan metnini (yoksa None) döndürür."""
+        reads = self.read(frame)
+        return reads[0].text if reads else None
@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+
+
+class EntryMotionGate:
+    """Giriş bölgesinde araç olup olmadığını ucuz arka plan farkıyla tahmin eder.
+
+    Bölge küçültülmüş gri görüntüde yavaş güncellenen bir arka planla karşılaştırılır; değişen piksel oranı
+    min_changed eşiğini aşarsa araç var kabul edilir. Bölge doluyken arka plan çok daha yavaş
+    (present_learning_rate) güncellenir, böylece geçen araç arka plana karışmaz. İlk karede duran araç,
+    bölgede park eden araç ya da ani ışık değişimi kapıyı sürekli açık bırakmasın diye max_present_frames
+    ardışık "araç var" karesinden sonra arka plan o anki kareyle yeniden başlatılır.
+    """
+
+    def __init__(self, roi=None, scale=0.25, diff_threshold=25, min_changed=0.02, learning_rate=0.02,
+                 present_learning_rate=0.002, max_present_frames=300):
+        self.roi = roi
+        self.scale = scale
+        self.diff_threshold = diff_threshold
+        self.min_changed = min_changed
+        self.learning_rate = learning_rate
+        self.present_learning_rate = present_learning_rate
+        self.max_present_frames = max_present_frames
+
+        self.background = None
+        self.present = False
+        self.present_frames = 0
+
+    def _prepare(self, frame):
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            frame = frame[y:y + h, x:x + w]
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def update(self, frame):
+        """Kareyi işler ve bölgede araç olup olmadığını döndürür."""
+        gray = self._prepare(frame)
+        if self.background is None:
+            self.background = gray.astype(np.float32)
+            return False
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        changed = cv2.countNonZero(cv2.threshold(diff, self.diff_threshold, 255, cv2.THRESH_BINARY)[1])
+        self.present = changed > self.min_changed * diff.size
+        self.present_frames = self.present_frames + 1 if self.present else 0
+
+        if self.present_frames > self.max_present_frames:
+            # Sahne kalıcı olarak değişmiş: yeni görüntü arka plan kabul edilir
+            self.background = gray.astype(np.float32)
+            self.present = False
+            self.present_frames = 0
+        else:
+            rate = self.present_learning_rate if self.present else self.learning_rate
+            cv2.accumulateWeighted(gray, self.background, rate)
+
+        return self.present
@@ -0,0 +1,155 @@
+import re
+from collections import Counter
+
+import cv2
+
+from plate_engine import normalize_plate
+
+
+# Türk plakası: il kodu (01-81), 1-3 harf, 2-4 rakam
+TR_PLATE_PATTERN = re.compile(r'(0[1-9]|[1-7][0-9]|8[01])[A-Z]{1,3}[0-9]{2,4}')
+
+
+def looks_like_plate(text, pattern=None):
+    """Oylanmış metnin plaka biçimine uyup uymadığını döndürür; pattern yoksa boş olmayan her metin kabul edilir."""
+    if not text:
+        return False
+    return pattern is None or pattern.fullmatch(text) is not None
+
+
+def bbox_iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(min(ax + aw, bx + bw) - max(ax, bx), 0)
+    ih = max(min(ay + ah, by + bh) - max(ay, by), 0)
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+def sharpness(gray_crop):
+    """Laplacian varyansı: bulanık karelerde düşük, net karelerde yüksek."""
+    return float(cv2.Laplacian(gray_crop, cv2.CV_64F).var())
+
+
+def vote_plate(reads):
+    """Okumalar arasında karakter bazında çoğunluk oylaması yapar.
+
+    Önce en sık görülen uzunluk seçilir, sonra o uzunluktaki okumalarda her konumun en sık karakteri alınır.
+    """
+    reads = [read for read in reads if read]
+    if not reads:
+        return None
+
+    length = Counter(len(read) for read in reads).most_common(1)[0][0]
+    same_length = [read for read in reads if len(read) == length]
+    return ''.join(Counter(chars).most_common(1)[0][0] for chars in zip(*same_length))
+
+
+class PlateTrack:
+    def __init__(self, track_id, bbox):
+        self.track_id = track_id
+        self.bbox = bbox
+        self.missed = 0
+        self.reads = []
+        self.best_sharpness = 0.0
+
+
+class PlateTracker:
+    """Plaka kutularını IoU ile araç izlerine gruplar; her iz için birkaç net karede OCR yapar
+    ve iz kapandığında oylanmış plakayı tek bir kayıt olarak on_plate'e iletir.
+
+    Araç başına tek kayıt için kareye en olası tek aday verilmelidir (PlateEngine(max_candidates=1)).
+    plate_pattern verilirse (örn. TR_PLATE_PATTERN) oylanmış metni uymayan izler kayıt yazılmadan atılır
+    ve atıldıkları yazdırılır; varsayılan olarak yabancı plakalar dahil her okuma kaydedilir.
+    """
+
+    def __init__(self, ocr, on_plate, iou_threshold=0.3, max_missed=10, reads_per_track=3, min_sharpness=50.0,
+                 plate_pattern=None):
+        self.ocr = ocr
+        self.on_plate = on_plate
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.reads_per_track = reads_per_track
+        self.min_sharpness = min_sharpness
+        self.plate_pattern = plate_pattern
+
+        self.tracks = []
+        self._next_id = 1
+
+    def _match(self, detections):
+        """Açgözlü bire bir eşleme: en yüksek IoU'lu (iz, tespit) çiftleri önce eşlenir."""
+        pairs = sorted(
+            ((bbox_iou(track.bbox, detection[0]), t_idx, d_idx)
+             for t_idx, track in enumerate(self.tracks) for d_idx, detection in enumerate(detections)),
+            reverse=True,
+        )
+
+        matched_tracks, matched_detections, matches = set(), set(), []
+        for iou, t_idx, d_idx in pairs:
+            if iou < self.iou_threshold:
+                break
+            if t_idx in matched_tracks or d_idx in matched_detections:
+                continue
+            matched_tracks.add(t_idx)
+            matched_detections.add(d_idx)
+            matches.append((self.tracks[t_idx], detections[d_idx]))
+
+        for d_idx, detection in enumerate(detections):
+            if d_idx not in matched_detections:
+                track = PlateTrack(self._next_id, detection[0])
+                self._next_id += 1
+                self.tracks.append(track)
+                matches.append((track, detection))
+
+        for t_idx, track in enumerate(self.tracks):
+            if t_idx not in matched_tracks:
+                track.missed += 1
+
+        return matches
+
+    def update(self, detections):
+        """detections: (bbox, ikili plaka kırpıntısı, gri plaka kırpıntısı) listesi.
+
+        Kapanan izlerin plakalarını (iz numarası, plaka) listesi olarak döndürür.
+        """
+        to_read = []
+        for track, (bbox, thresh_crop, gray_crop) in self._match(detections):
+            track.bbox = bbox
+            track.missed = 0
+
+            # Yeterince okuma toplanmamış izlerde yalnızca net (ve izin en netine yakın) kareler okunur
+            if len(track.reads) >= self.reads_per_track:
+                continue
+            score = sharpness(gray_crop)
+            if score < max(self.min_sharpness, 0.8 * track.best_sharpness):
+                continue
+            to_read.append((track, thresh_crop, score))
+
+        if to_read:
+            texts = self.ocr.recognize_batch([crop for _, crop, _ in to_read])
+            for (track, _, score), text in zip(to_read, texts):
+                text = normalize_plate(text).upper()
+                # Boş okumalar (araç henüz uzaktayken sık) okuma hakkından düşmez
+                if text:
+                    track.reads.append(text)
+                    track.best_sharpness = max(track.best_sharpness, score)
+
+        return self._close([track for track in self.tracks if track.missed > self.max_missed])
+
+    def flush(self):
+        """Akış bittiğinde açık kalan tüm izleri kapatır."""
+        return self._close(list(self.tracks))
+
+    def _close(self, finished):
+        plates = []
+        for track in finished:
+            self.tracks.remove(track)
+            plate = vote_plate(track.reads)
+            if not looks_like_plate(plate, self.plate_pattern):
+                if plate:
+                    print(f"İz {track.track_id} plaka biçimine uymadığı için kaydedilmedi: {plate}")
+                continue
+            self.on_plate(plate)
+            plates.append((track.track_id, plate))
+        return plates
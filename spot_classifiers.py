@@ -0,0 +1,175 @@
+import argparse
+import csv
+import time
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC, LinearSVC
+
+from dataset_builder import build_dataset
+
+
+class ColorHistogramFeatures(BaseEstimator, TransformerMixin):
+    """(N, 675) düz 15x15x3 öznitelikleri kanal başına renk histogramlarına çevirir."""
+
+    def __init__(self, bins=8):
+        self.bins = bins
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float32).reshape(len(X), -1, 3)
+        n, pixels, channels = X.shape
+
+        # Her (örnek, kanal, kutu) üçlüsü tek bir bincount indeksine düşer
+        bins = np.minimum((X * self.bins).astype(np.intp), self.bins - 1)
+        offsets = (np.arange(n)[:, None, None] * channels + np.arange(channels)[None, None, :]) * self.bins
+        counts = np.bincount((bins + offsets).ravel(), minlength=n * channels * self.bins)
+
+        return counts.reshape(n, channels * self.bins).astype(np.float32) / pixels
+
+
+class HogFeatures(BaseEstimator, TransformerMixin):
+    """15x15 gri görüntüden vektörleştirilmiş HOG: 3x3 piksellik hücrelerde yön histogramı."""
+
+    def __init__(self, cell=3, orientations=9, size=15):
+        self.cell = cell
+        self.orientations = orientations
+        self.size = size
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float32).reshape(len(X), self.size, self.size, 3)
+        gray = X.mean(axis=3)
+
+        gy, gx = np.gradient(gray, axis=(1, 2))
+        magnitude = np.hypot(gx, gy)
+        # İşaretsiz yön: [0, pi)
+        angle = np.mod(np.arctan2(gy, gx), np.pi)
+        bins = np.minimum((angle / np.pi * self.orientations).astype(np.intp), self.orientations - 1)
+
+        cells = self.size // self.cell
+        usable = cells * self.cell
+        n = len(X)
+        cell_y = (np.arange(usable) // self.cell)[:, None]
+        cell_x = (np.arange(usable) // self.cell)[None, :]
+        cell_idx = (cell_y * cells + cell_x)[None, :, :]
+
+        index = ((np.arange(n)[:, None, None] * cells * cells + cell_idx) * self.orientations
+                 + bins[:, :usable, :usable])
+        hist = np.bincount(index.ravel(), weights=magnitude[:, :usable, :usable].ravel(),
+                           minlength=n * cells * cells * self.orientations)
+        hist = hist.reshape(n, cells * cells * self.orientations)
+
+        return (hist / (np.linalg.norm(hist, axis=1, keepdims=True) + 1e-6)).astype(np.float32)
+
+
+def candidate_models():
+    """empty_or_not arayüzüne (predict on (N, 675)) uyan aday sınıflandırıcılar."""
+    return {
+        'svc_rbf': SVC(gamma=0.001, C=10),
+        'histogram_logreg': make_pipeline(ColorHistogramFeatures(), StandardScaler(), LogisticRegression(max_iter=1000)),
+        'hog_linear_svc': make_pipeline(HogFeatures(), StandardScaler(), LinearSVC()),
+        'gradient_boosting': HistGradientBoostingClassifier(max_iter=100, max_depth=4),
+    }
+
+
+def measure_latency(model, X, spot_count, repeats=5):
+    """spot_count alanlık bir kare için predict süresini (ms, en iyi tekrar) ölçer."""
+    batch = np.ascontiguousarray(np.resize(np.asarray(X, dtype=np.float32), (spot_count, X.shape[1])))
+    model.predict(batch)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(batch)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def select_model(data, labels, spot_count, budget_ms, models=None, report_path=None):
+    """Kare başına gecikme bütçesini karşılayan en doğru modeli seçer; (ad, model, rapor) döndürür."""
+    models = models or candidate_models()
+    x_train, x_test, y_train, y_test = train_test_split(data, labels, test_size=0.2, shuffle=True,
+                                                        stratify=labels, random_state=0)
+
+    rows = []
+    fitted = {}
+    for name, model in models.items():
+        start = time.perf_counter()
+        model.fit(x_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        rows.append({
+            'model': name,
+            'fit_time_s': round(fit_time, 3),
+            'frame_latency_ms': round(measure_latency(model, x_test, spot_count), 3),
+            'accuracy': round(accuracy_score(y_test, model.predict(x_test)), 4),
+        })
+        fitted[name] = model
+
+    rows.sort(key=lambda row: (-row['accuracy'], row['frame_latency_ms']))
+    if report_path:
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    within_budget = [row for row in rows if row['frame_latency_ms'] <= budget_ms]
+    if not within_budget:
+        return None, None, rows
+
+    best = within_budget[0]['model']
+    return best, fitted[best], rows
+
+
+def main():
+    import joblib
+
+    # Sınıflar __main__ yerine modülden alınır; aksi halde pickle içindeki dönüştürücüler
+    # __main__.HogFeatures gibi kaydedilir ve model_registry modeli açamaz
+    from spot_classifiers import candidate_models, select_model
+    from model_registry import load_model
+
+    parser = argparse.ArgumentParser(description="Gecikme bütçesine göre park alanı sınıflandırıcısı seçimi")
+    parser.add_argument("input_dir", help="empty / not_empty klasörlerini içeren eğitim verisi")
+    parser.add_argument("--spots", type=int, default=380, help="karedeki park alanı sayısı")
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="kare başına sınıflandırma bütçesi (ms)")
+    parser.add_argument("--output", default="model.joblib")
+    parser.add_argument("--report", default="model_selection_report.csv")
+    args = parser.parse_args()
+
+    data, labels = build_dataset(args.input_dir)
+    name, model, rows = select_model(data, labels, args.spots, args.budget_ms, models=candidate_models(),
+                                     report_path=args.report)
+
+    for row in rows:
+        print(f"{row['model']:<20} doğruluk {row['accuracy']:.4f}  {row['frame_latency_ms']:.2f} ms/kare  "
+              f"eğitim {row['fit_time_s']:.1f} s")
+
+    if model is None:
+        print(f"{args.spots} alan için {args.budget_ms} ms bütçesini karşılayan model yok")
+        return
+
+    # Sıkıştırmasız joblib: model_registry mmap ile açabilir
+    joblib.dump(model, args.output, compress=0)
+
+    # Kaydedilen model, çalışma zamanındaki yükleme yoluyla açılıp aynı tahminleri vermeli
+    sample = data[:200]
+    if not np.array_equal(load_model(args.output).predict(sample), model.predict(sample)):
+        raise SystemExit(f"{args.output} yeniden yüklendiğinde farklı tahmin veriyor")
+    print(f"Seçilen model: {name} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
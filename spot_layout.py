@@ -0,0 +1,292 @@
+import hashlib
+import os
+import sys
+import tempfile
+import zipfile
+
+import cv2
+import numpy as np
+
+from util import get_parking_spots_bboxes
+
+
+class SpotLayout:
+    """Maskeden türetilen park alanı düzeni: bbox'lar, merkezler, alan numaraları ve etiket görüntüsü."""
+
+    def __init__(self, bboxes, centroids, spot_ids, labels, mask_hash, polygons=None):
+        self.bboxes = np.asarray(bboxes, dtype=np.int32).reshape(-1, 4)
+        # Alan başına 4 köşe (sol üst, sağ üst, sağ alt, sol alt); açılı kameralar için
+        self.polygons = None if polygons is None else np.asarray(polygons, dtype=np.float32).reshape(-1, 4, 2)
+        self.centroids = np.asarray(centroids, dtype=np.float32).reshape(-1, 2)
+        self.spot_ids = np.asarray(spot_ids, dtype=np.int32)
+        self.labels = labels
+        self.mask_hash = str(mask_hash)
+
+    @property
+    def spots(self):
+        """get_parking_spots_bboxes ile aynı biçimde [x, y, w, h] listesi."""
+        return self.bboxes.tolist()
+
+    def __len__(self):
+        return len(self.bboxes)
+
+    @classmethod
+    def from_mask(cls, mask, mask_hash=""):
+        total_labels, labels, values, centroids = cv2.connectedComponentsWithStats(mask, 4, cv2.CV_32S)
+        bboxes = get_parking_spots_bboxes((total_labels, labels, values, centroids))
+
+        # 0 arka plandır; alan numaraları 1'den başlar
+        label_dtype = np.uint16 if total_labels <= np.iinfo(np.uint16).max else np.int32
+        polygons = spot_polygons(labels, bboxes)
+        return cls(bboxes, centroids[1:], np.arange(1, total_labels), labels.astype(label_dtype), mask_hash,
+                   polygons)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['bboxes'], data['centroids'], data['spot_ids'], data['labels'], data['mask_hash'],
+                       data['polygons'])
+
+    def save(self, path):
+        """Aynı klasörde geçici dosyaya yazıp yerine taşır; aynı maskeyi okuyan işlemler yarım dosya görmez."""
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, bboxes=self.bboxes, centroids=self.centroids, spot_ids=self.spot_ids,
+                                    labels=self.labels, mask_hash=np.array(self.mask_hash), polygons=self.polygons)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def order_corners(corners):
+    """Dört köşeyi sol üst, sağ üst, sağ alt, sol alt sırasına koyar."""
+    corners = np.asarray(corners, dtype=np.float32).reshape(4, 2)
+
+    # Merkeze göre açıya sıralanınca (y aşağı doğru) köşeler saat yönünde dizilir
+    center = corners.mean(axis=0)
+    corners = corners[np.argsort(np.arctan2(corners[:, 1] - center[1], corners[:, 0] - center[0]))]
+
+    return np.roll(corners, -int(np.argmin(corners.sum(axis=1))), axis=0)
+
+
+def spot_polygons(labels, bboxes):
+    """Her alanın maske konturundan dörtgen köşelerini çıkarır; dörtgene indirgenemezse en küçük döndürülmüş dikdörtgen."""
+    polygons = np.zeros((len(bboxes), 4, 2), dtype=np.float32)
+    for idx, (x, y, w, h) in enumerate(bboxes):
+        component = (labels[y:y + h, x:x + w] == idx + 1).astype(np.uint8)
+        contours, _ = cv2.findContours(component, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            polygons[idx] = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+            continue
+
+        hull = cv2.convexHull(max(contours, key=cv2.contourArea))
+        approx = cv2.approxPolyDP(hull, 0.02 * cv2.arcLength(hull, True), True)
+        corners = approx if len(approx) == 4 else cv2.boxPoints(cv2.minAreaRect(hull))
+        polygons[idx] = order_corners(corners) + (x, y)
+
+    return polygons
+
+
+class SpotIndex:
+    """Park alanı bbox'ları üzerinde düzgün ızgara indeksi: nokta, dikdörtgen ve en yakın alan sorguları.
+
+    Sorgular kare koordinatlarıyla yapılır; display_size=(genişlik, yükseklik) verilirse koordinatlar
+    o gösterim boyutundan kare boyutuna ölçeklenir. Dönen değerler 0 tabanlı alan indeksleridir.
+    """
+
+    def __init__(self, layout, cell_size=None):
+        self.bboxes = layout.bboxes.astype(np.int64)
+        self.frame_size = (layout.labels.shape[1], layout.labels.shape[0])
+        self.zones = {}
+
+        if cell_size is None:
+            sizes = np.maximum(self.bboxes[:, 2], self.bboxes[:, 3])
+            cell_size = int(np.median(sizes)) if len(sizes) else 64
+        self.cell_size = max(int(cell_size), 1)
+
+        self.grid_w = -(-self.frame_size[0] // self.cell_size)
+        self.grid_h = -(-self.frame_size[1] // self.cell_size)
+
+        # Her hücre, kendisiyle kesişen alanların indekslerini tutar
+        self.cells = {}
+        for idx, (x, y, w, h) in enumerate(self.bboxes):
+            cx0, cy0 = self._cell(x, y)
+            cx1, cy1 = self._cell(x + w, y + h)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(idx)
+
+    def _cell(self, x, y):
+        cx = min(max(int(x) // self.cell_size, 0), self.grid_w - 1)
+        cy = min(max(int(y) // self.cell_size, 0), self.grid_h - 1)
+        return cx, cy
+
+    def _to_frame(self, x, y, display_size):
+        if display_size is None:
+            return x, y
+        return x * self.frame_size[0] / display_size[0], y * self.frame_size[1] / display_size[1]
+
+    def _distances(self, candidates, x, y):
+        x1, y1, w, h = self.bboxes[candidates].T
+        dx = np.maximum(np.maximum(x1 - x, x - (x1 + w)), 0)
+        dy = np.maximum(np.maximum(y1 - y, y - (y1 + h)), 0)
+        return np.hypot(dx, dy)
+
+    def spot_at(self, x, y, display_size=None):
+        """Noktayı içeren alanın indeksini döndürür; yoksa None."""
+        x, y = self._to_frame(x, y, display_size)
+        candidates = self.cells.get(self._cell(x, y))
+        if not candidates:
+            return None
+
+        hits = np.flatnonzero(self._distances(candidates, x, y) == 0)
+        return int(candidates[hits[0]]) if len(hits) else None
+
+    def spots_in_rect(self, x, y, w, h, display_size=None):
+        """Dikdörtgenle kesişen alanların sıralı indekslerini döndürür."""
+        x1, y1 = self._to_frame(x, y, display_size)
+        x2, y2 = self._to_frame(x + w, y + h, display_size)
+        cx0, cy0 = self._cell(x1, y1)
+        cx1, cy1 = self._cell(x2, y2)
+
+        candidates = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                candidates.update(self.cells.get((cx, cy), ()))
+        if not candidates:
+            return np.zeros(0, dtype=np.intp)
+
+        candidates = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        bx, by, bw, bh = self.bboxes[candidates].T
+        overlap = (bx <= x2) & (bx + bw >= x1) & (by <= y2) & (by + bh >= y1)
+        return np.sort(candidates[overlap])
+
+    def nearest(self, x, y, display_size=None, max_distance=None):
+        """Noktaya en yakın alanın indeksini döndürür; max_distance içinde alan yoksa None."""
+        x, y = self._to_frame(x, y, display_size)
+        cx, cy = self._cell(x, y)
+
+        best, best_distance = None, np.inf
+        for ring in range(max(self.grid_w, self.grid_h)):
+            # Bu halkadaki hücreler en az (ring - 1) hücre uzaklıktadır
+            lower_bound = max(ring - 1, 0) * self.cell_size
+            if lower_bound > best_distance or (max_distance is not None and lower_bound > max_distance):
+                break
+
+            candidates = []
+            for ry in range(cy - ring, cy + ring + 1):
+                for rx in range(cx - ring, cx + ring + 1):
+                    if max(abs(rx - cx), abs(ry - cy)) == ring:
+                        candidates.extend(self.cells.get((rx, ry), ()))
+            if not candidates:
+                continue
+
+            distances = self._distances(candidates, x, y)
+            closest = int(np.argmin(distances))
+            if distances[closest] < best_distance:
+                best, best_distance = int(candidates[closest]), float(distances[closest])
+
+        if max_distance is not None and best_distance > max_distance:
+            return None
+        return best
+
+    def add_zone(self, name, x, y, w, h, display_size=None):
+        """Adlandırılmış bir bölge tanımlar (ör. "B bölümü") ve içindeki alanları önceden hesaplar."""
+        self.zones[name] = self.spots_in_rect(x, y, w, h, display_size)
+        return self.zones[name]
+
+    def spots_in_zone(self, name):
+        return self.zones[name]
+
+
+class RegionOfInterest:
+    """Tüm park alanlarını kapsayan bölge: kareyi bir kez kırpar ve isteğe bağlı olarak küçültür.
+
+    Alan koordinatları (bbox ve çokgenler) kırpılmış / ölçeklenmiş kareye göre yeniden hesaplanır.
+    """
+
+    def __init__(self, layout, scale=1.0, margin=0):
+        frame_h, frame_w = layout.labels.shape[:2]
+        bboxes = layout.bboxes.astype(np.int64)
+
+        if len(bboxes):
+            x1 = max(int(bboxes[:, 0].min()) - margin, 0)
+            y1 = max(int(bboxes[:, 1].min()) - margin, 0)
+            x2 = min(int((bboxes[:, 0] + bboxes[:, 2]).max()) + margin, frame_w)
+            y2 = min(int((bboxes[:, 1] + bboxes[:, 3]).max()) + margin, frame_h)
+        else:
+            x1, y1, x2, y2 = 0, 0, frame_w, frame_h
+
+        self.rect = (x1, y1, x2 - x1, y2 - y1)
+        self.scale = scale
+        self.output_size = (max(int(round((x2 - x1) * scale)), 1), max(int(round((y2 - y1) * scale)), 1))
+
+        # get_parking_spots_bboxes'taki coef ile aynı: koordinatlar ölçek katsayısıyla çarpılır
+        origin = np.array([x1, y1])
+        scaled = np.empty_like(bboxes)
+        scaled[:, :2] = np.round((bboxes[:, :2] - origin) * scale)
+        scaled[:, 2:] = np.maximum(np.round(bboxes[:, 2:] * scale), 1)
+        # Yuvarlama bbox'ı bölge dışına taşırmasın
+        scaled[:, 2] = np.minimum(scaled[:, 2], self.output_size[0] - scaled[:, 0])
+        scaled[:, 3] = np.minimum(scaled[:, 3], self.output_size[1] - scaled[:, 1])
+        self.spots = scaled.tolist()
+        self.polygons = None if layout.polygons is None else (layout.polygons - origin) * np.float32(scale)
+
+        # Küçültme yapılıyorsa sonuç her karede aynı tampona yazılır
+        self._buffer = None
+        if scale != 1.0:
+            self._buffer = np.empty((self.output_size[1], self.output_size[0], 3), dtype=np.uint8)
+
+    def apply(self, frame):
+        """Kareyi bölgeye kırpar (kopyasız görünüm); ölçek 1 değilse yeniden kullanılan tampona küçültür."""
+        x, y, w, h = self.rect
+        view = frame[y:y + h, x:x + w]
+        if self._buffer is None:
+            return view
+
+        return cv2.resize(view, self.output_size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+
+    def to_frame(self, x, y):
+        """Bölge koordinatlarını tam kare koordinatlarına çevirir."""
+        return self.rect[0] + x / self.scale, self.rect[1] + y / self.scale
+
+
+def mask_digest(mask_path):
+    with open(mask_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def default_layout_path(mask_path):
+    return os.path.splitext(mask_path)[0] + '.layout.npz'
+
+
+def load_spot_layout(mask_path, layout_path=None):
+    """Düzeni önbellekten yükler; maske değiştiyse (hash farklıysa) yeniden oluşturup kaydeder."""
+    layout_path = layout_path or default_layout_path(mask_path)
+    digest = mask_digest(mask_path)
+
+    if os.path.exists(layout_path):
+        try:
+            layout = SpotLayout.load(layout_path)
+            if layout.mask_hash == digest:
+                return layout
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            # Bozuk, yarım yazılmış ya da eski biçimli önbellek yeniden oluşturulur
+            pass
+
+    layout = SpotLayout.from_mask(cv2.imread(mask_path, 0), digest)
+    try:
+        layout.save(layout_path)
+    except OSError as e:
+        print(f"Park düzeni önbelleğe yazılamadı: {e}")
+
+    return layout
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or ['mask_1920_1080.png']:
+        layout = load_spot_layout(path)
+        print(f"{path}: {len(layout)} park alanı -> {default_layout_path(path)}")
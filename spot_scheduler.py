@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+
+
+class SpotScheduler:
+    """Kare başına zaman bütçesine sığdığı kadar park alanını, en eski doğrulanandan başlayarak sınıflandırır."""
+
+    def __init__(self, spot_count, frame_budget=0.02, max_age=30.0, chunk_size=32):
+        self.frame_budget = frame_budget
+        self.max_age = max_age
+        self.chunk_size = chunk_size
+
+        # Her alanın son doğrulanma zamanı (time.time); -inf = henüz hiç sınıflandırılmadı
+        self.last_verified = np.full(spot_count, -np.inf)
+
+        # Alan başına ortalama sınıflandırma süresi (saniye), ilk parçadan sonra öğrenilir
+        self.spot_cost = None
+
+    def age(self, now=None):
+        """Alanların son doğrulamadan bu yana geçen süresini döndürür."""
+        now = time.time() if now is None else now
+        return now - self.last_verified
+
+    def run(self, pending, classify, now=None):
+        """Bekleyen ve süresi dolmuş alanları bütçe dahilinde classify(indeksler) ile işler.
+
+        frame_budget None ise bütün bekleyen alanlar tek classify çağrısında işlenir.
+
+        İşlenemeyen alanlar sonraki karede öncelikli olarak tekrar sıraya girer.
+        İşlenen alanların indekslerini döndürür.
+        """
+        start = time.perf_counter()
+        now = time.time() if now is None else now
+
+        pending = np.asarray(pending, dtype=np.intp)
+        if self.max_age is not None:
+            pending = np.union1d(pending, np.flatnonzero(self.age(now) > self.max_age))
+
+        # En eski doğrulanan önce; eşitlikte indeks sırası korunur (round-robin)
+        order = pending[np.argsort(self.last_verified[pending], kind="stable")]
+
+        done = 0
+        while done < len(order):
+            # Bütçe yoksa parçalamanın anlamı yok: tüm alanlar tek vektörel çağrıda sınıflandırılır
+            count = self.chunk_size if self.frame_budget is not None else len(order)
+            if self.spot_cost and self.frame_budget is not None:
+                remaining = self.frame_budget - (time.perf_counter() - start)
+                count = min(count, int(remaining / self.spot_cost))
+                # Her karede en az bir alan işlenir, böylece hiçbir alan sonsuza dek beklemez
+                if count <= 0:
+                    if done:
+                        break
+                    count = 1
+
+            batch = order[done:done + count]
+            chunk_start = time.perf_counter()
+            classify(batch)
+            cost = (time.perf_counter() - chunk_start) / len(batch)
+            self.spot_cost = cost if self.spot_cost is None else 0.8 * self.spot_cost + 0.2 * cost
+
+            done += len(batch)
+
+        processed = order[:done]
+        self.last_verified[processed] = now
+
+        return processed
@@ -0,0 +1,105 @@
+import os
+import sys
+
+import numpy as np
+
+
+class CompiledSVC:
+    """Eğitilmiş RBF SVC'nin scikit-learn gerektirmeyen, vektörleştirilmiş NumPy karar fonksiyonu."""
+
+    def __init__(self, support_vectors, dual_coef, intercept, gamma, classes):
+        self.support_vectors = np.ascontiguousarray(support_vectors)
+        self.dual_coef = np.asarray(dual_coef, dtype=np.float64).ravel()
+        self.intercept = float(np.asarray(intercept).ravel()[0])
+        self.gamma = float(gamma)
+        self.classes = np.asarray(classes)
+        self.classes_ = self.classes
+
+        # ||sv||^2 her çağrıda yeniden hesaplanmasın
+        self._sv_sq_norms = np.einsum("ij,ij->i", self.support_vectors, self.support_vectors)
+
+    @classmethod
+    def from_sklearn(cls, model, dtype=np.float64):
+        if model.kernel != "rbf":
+            raise ValueError(f"Yalnızca RBF çekirdeği destekleniyor: {model.kernel}")
+        if len(model.classes_) != 2:
+            raise ValueError("Yalnızca iki sınıflı (boş / dolu) SVC destekleniyor")
+
+        # _gamma, gamma='scale' / 'auto' durumunda eğitimde hesaplanan gerçek değerdir
+        return cls(model.support_vectors_.astype(dtype), model.dual_coef_, model.intercept_,
+                   getattr(model, "_gamma", model.gamma), model.classes_)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["support_vectors"], data["dual_coef"], data["intercept"],
+                       data["gamma"], data["classes"])
+
+    def save(self, path):
+        np.savez(path, support_vectors=self.support_vectors, dual_coef=self.dual_coef,
+                 intercept=np.array([self.intercept]), gamma=np.array(self.gamma), classes=self.classes)
+
+    def decision_function(self, X):
+        """Tüm parti için RBF karar değerlerini döndürür; pozitif değer classes[1] demektir."""
+        X = np.asarray(X, dtype=self.support_vectors.dtype).reshape(len(X), -1)
+
+        # ||x - sv||^2 = ||x||^2 + ||sv||^2 - 2 x.sv
+        kernel = X @ self.support_vectors.T
+        kernel *= -2
+        kernel += np.einsum("ij,ij->i", X, X)[:, None]
+        kernel += self._sv_sq_norms[None, :]
+        np.maximum(kernel, 0, out=kernel)
+        kernel *= -self.gamma
+        np.exp(kernel, out=kernel)
+
+        return kernel @ self.dual_coef.astype(kernel.dtype) + self.intercept
+
+    def decide(self, X):
+        """(etiketler, marjlar) döndürür; marj karar değerinin mutlak değeridir."""
+        decisions = self.decision_function(X)
+        return self.classes[(decisions > 0).astype(np.intp)], np.abs(decisions)
+
+    def predict(self, X):
+        return self.decide(X)[0]
+
+
+def export_svc(model, path, dtype=np.float64):
+    """Eğitilmiş SVC'nin yalnızca karar için gereken parametrelerini .npz dosyasına yazar."""
+    compiled = CompiledSVC.from_sklearn(model, dtype=dtype)
+    compiled.save(path)
+    return compiled
+
+
+def load_training_crops(input_dir, categories=('empty', 'not_empty')):
+    """model_egitim.py ile aynı şekilde eğitim kırpıntılarını okur."""
+    from dataset_builder import build_dataset
+
+    return build_dataset(input_dir, categories)[0]
+
+
+def verify_equivalence(model, compiled, X):
+    """Derlenmiş motorun tahminlerini MODEL.predict ile karşılaştırır; uyuşmayan örnek sayısını döndürür."""
+    expected = model.predict(X)
+    labels, _ = compiled.decide(X)
+    decision_error = np.max(np.abs(model.decision_function(X) - compiled.decision_function(X)), initial=0.0)
+
+    mismatches = int(np.count_nonzero(labels != expected))
+    print(f"{len(X)} örnek karşılaştırıldı: {mismatches} uyuşmazlık, en büyük karar farkı {decision_error:.2e}")
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    # Kullanım: python svm_engine.py model.p model.npz [clf-data]
+    from model_registry import load_model
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "model.p"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(model_path)[0] + ".npz"
+
+    model = load_model(model_path)
+    compiled = export_svc(model, output_path)
+    print(f"{len(compiled.support_vectors)} destek vektörü {output_path} dosyasına yazıldı")
+
+    if len(sys.argv) > 3:
+        crops = load_training_crops(sys.argv[3])
+        sys.exit(1 if verify_equivalence(model, compiled, crops) else 0)
@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+svm = pytest.importorskip("sklearn.svm")
+
+from svm_engine import CompiledSVC, export_svc, verify_equivalence
+from model_registry import load_model
+
+
+@pytest.fixture(scope="module")
+def fitted_svc():
+    # 15x15x3 yama öznitelikleri ile aynı boyut (675); iki sınıf farklı parlaklık dağılımlarından
+    rng = np.random.default_rng(0)
+    X = np.vstack([rng.normal(0.35, 0.1, (60, 675)), rng.normal(0.6, 0.1, (60, 675))]).clip(0, 1)
+    y = np.repeat([0, 1], 60)
+    return svm.SVC(C=10, gamma=0.001).fit(X, y), X, rng.random((200, 675))
+
+
+def test_compiled_svc_matches_sklearn(fitted_svc, tmp_path):
+    model, X, X_new = fitted_svc
+    compiled = export_svc(model, tmp_path / "model.npz")
+
+    for data in (X, X_new):
+        np.testing.assert_array_equal(compiled.predict(data), model.predict(data))
+        np.testing.assert_allclose(compiled.decision_function(data), model.decision_function(data),
+                                   rtol=1e-7, atol=1e-9)
+    assert verify_equivalence(model, compiled, X_new) == 0
+
+
+def test_exported_model_round_trips(fitted_svc, tmp_path):
+    model, X, _ = fitted_svc
+    path = tmp_path / "model.npz"
+    export_svc(model, path)
+
+    loaded = load_model(str(path))
+    assert isinstance(loaded, CompiledSVC)
+    np.testing.assert_array_equal(loaded.classes_, model.classes_)
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+
+def test_rejects_non_rbf_kernel(fitted_svc):
+    _, X, _ = fitted_svc
+    linear = svm.SVC(kernel="linear").fit(X, np.repeat([0, 1], 60))
+    with pytest.raises(ValueError):
+        CompiledSVC.from_sklearn(linear)
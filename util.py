@@ -1,14 +1,19 @@
-import pickle
-
 from skimage.transform import resize
 import numpy as np
 import cv2
 
+from model_registry import get_model
+
 
 EMPTY = True
 NOT_EMPTY = False
 
-MODEL = pickle.load(open(r"C:\Users\altay\Desktop\Master's Degree\Bitirme Tezi Kodlar\otoparkalgi\parking-space-counter-master\model.p", "rb"))
+
+def __getattr__(name):
+    # util.MODEL geriye dönük uyumluluk için korunur; model ilk erişimde yüklenir
+    if name == "MODEL":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def empty_or_not(spot_bgr):
@@ -19,7 +24,7 @@ def empty_or_not(spot_bgr):
     flat_data.append(img_resized.flatten())
     flat_data = np.array(flat_data)
 
-    y_output = MODEL.predict(flat_data)
+    y_output = get_model().predict(flat_data)
 
     if y_output == 0:
         return EMPTY
@@ -27,11 +32,165 @@ def empty_or_not(spot_bgr):
         return NOT_EMPTY
 
 
-def get_parking_spots_bboxes(connected_components):
+class SpotFeatureExtractor:
+    """Park alanı kırpıntılarını önceden ayrılmış float32 tampona 15x15x3 öznitelik olarak yazar."""
+
+    def __init__(self, spots, size=15):
+        self.spots = [tuple(int(v) for v in spot) for spot in spots]
+        self.size = size
+
+        # Kareler arasında yeniden kullanılan tamponlar
+        self.pixels = np.empty((len(self.spots), size, size, 3), dtype=np.uint8)
+        self.features = np.empty((len(self.spots), size * size * 3), dtype=np.float32)
+
+    def extract(self, frame, indices=None):
+        """Seçilen alanların (N, 675) öznitelik matrisini döndürür; sonuç tamponun bir görünümüdür."""
+        if indices is None:
+            indices = range(len(self.spots))
+
+        count = len(indices)
+        for row, idx in enumerate(indices):
+            x, y, w, h = self.spots[idx]
+            cv2.resize(frame[y:y + h, x:x + w], (self.size, self.size),
+                       dst=self.pixels[row], interpolation=cv2.INTER_AREA)
+
+        # skimage resize ile aynı ölçek: [0, 1] aralığında, BGR sırasıyla düzleştirilmiş
+        features = self.features[:count]
+        np.multiply(self.pixels[:count].reshape(count, self.features.shape[1]), np.float32(1.0 / 255),
+                    out=features, dtype=np.float32)
+
+        return features
+
+
+class SpotRectifier:
+    """Çokgen (açılı) park alanlarını tek bir cv2.remap çağrısıyla 15x15 yamalara düzeltir.
+
+    Tüm alanların perspektif dönüşümleri tek bir döşeme haritasında önceden hesaplanır;
+    her karede bir remap, bütün alanların yamalarını yan yana içeren görüntüyü üretir.
+    """
+
+    def __init__(self, polygons, size=15):
+        polygons = np.asarray(polygons, dtype=np.float32).reshape(-1, 4, 2)
+        self.count = len(polygons)
+        self.size = size
+        self.cols = max(1, int(np.ceil(np.sqrt(self.count))))
+        self.rows = max(1, -(-self.count // self.cols))
+
+        # Yama piksel merkezleri, köşe sırası: sol üst, sağ üst, sağ alt, sol alt
+        square = np.float32([[0, 0], [size, 0], [size, size], [0, size]])
+        v, u = np.mgrid[0:size, 0:size].astype(np.float32) + 0.5
+        points = np.stack((u, v, np.ones_like(u)), axis=-1).reshape(-1, 3)
+
+        map_xy = np.full((self.rows * self.cols, size * size, 2), -1, dtype=np.float32)
+        if self.count:
+            transforms = np.stack([cv2.getPerspectiveTransform(square, polygon) for polygon in polygons])
+            source = points @ transforms.transpose(0, 2, 1)
+            map_xy[:self.count] = source[..., :2] / source[..., 2:]
+
+        # (alan, v, u) -> döşeme görüntüsü (satır * v, sütun * u)
+        map_xy = map_xy.reshape(self.rows, self.cols, size, size, 2).transpose(0, 2, 1, 3, 4)
+        map_xy = np.ascontiguousarray(map_xy.reshape(self.rows * size, self.cols * size, 2))
+        self.map1, self.map2 = cv2.convertMaps(map_xy, None, cv2.CV_16SC2)
+
+        # Kareler arasında yeniden kullanılan tamponlar
+        self.tiles = np.empty((self.rows * size, self.cols * size, 3), dtype=np.uint8)
+        self.patches = np.empty((self.rows * self.cols, size, size, 3), dtype=np.float32)
+        self.features = self.patches.reshape(self.rows * self.cols, -1)[:self.count]
+
+    def rectify(self, frame):
+        """Tüm alanları tek remap ile döşeme görüntüsüne yazar ve öznitelik tamponunu günceller."""
+        cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR, dst=self.tiles,
+                  borderMode=cv2.BORDER_CONSTANT)
+
+        tiles = self.tiles.reshape(self.rows, self.size, self.cols, self.size, 3).transpose(0, 2, 1, 3, 4)
+        np.multiply(tiles, np.float32(1.0 / 255),
+                    out=self.patches.reshape(self.rows, self.cols, self.size, self.size, 3), dtype=np.float32)
+
+        return self.features
+
+    def extract(self, frame, indices=None):
+        """SpotFeatureExtractor ile aynı arayüz; her çağrıda tüm alanlar yeniden düzeltilir.
+
+        Aynı karenin birden çok alan grubu için rectify() bir kez çağrılıp features tamponu kullanılmalıdır.
+        """
+        features = self.rectify(frame)
+        return features if indices is None else features[indices]
+
+
+def empty_or_not_batch(frame, spots, indices=None, return_margin=False):
+    """Park alanlarını tek bir predict çağrısıyla sınıflandırır, durum dizisi döndürür.
+
+    spots bir bbox listesi ya da kareler arasında saklanan bir SpotFeatureExtractor / SpotRectifier olabilir.
+    return_margin=True ise (durum, marj) döndürülür; marj karar fonksiyonunun mutlak değeridir.
+    """
+    extractor = spots if hasattr(spots, 'extract') else SpotFeatureExtractor(spots)
+
+    return classify_features(extractor.extract(frame, indices), return_margin)
+
+
+def classify_features(flat_data, return_margin=False):
+    """Önceden çıkarılmış 15x15 yama özniteliklerini sınıflandırır; empty_or_not_batch ile aynı dönüş."""
+    if len(flat_data) == 0:
+        empty = np.zeros(0, dtype=bool)
+        return (empty, np.zeros(0)) if return_margin else empty
+
+    model = get_model()
+    if not return_margin:
+        return np.asarray(model.predict(flat_data)) == 0
+    if not hasattr(model, 'decision_function'):
+        return np.asarray(model.predict(flat_data)) == 0, np.full(len(flat_data), np.nan)
+
+    # İki sınıflı SVC'de tahmin, karar fonksiyonunun işaretidir; ikinci bir predict çağrısı gerekmez
+    decisions = np.asarray(model.decision_function(flat_data)).ravel()
+    y_output = model.classes_[(decisions > 0).astype(np.intp)]
+
+    return y_output == 0, np.abs(decisions)
+
+
+class SpotChangeDetector:
+    """Park alanlarının parlaklık imzasını izler, yalnızca değişen alanları yeniden sınıflandırmaya gönderir."""
+
+    def __init__(self, spots, threshold=8.0):
+        bboxes = np.asarray(spots, dtype=np.intp).reshape(-1, 4)
+        self.x1 = bboxes[:, 0]
+        self.y1 = bboxes[:, 1]
+        self.x2 = self.x1 + bboxes[:, 2]
+        self.y2 = self.y1 + bboxes[:, 3]
+        self.area = np.maximum(bboxes[:, 2] * bboxes[:, 3], 1).astype(np.float64)
+        self.threshold = threshold
+
+        # Son sınıflandırma anındaki (ortalama, std) imzası; NaN = hiç sınıflandırılmadı
+        self.reference = np.full((len(bboxes), 2), np.nan)
+
+    def _box_sums(self, integral):
+        return (integral[self.y2, self.x2] - integral[self.y1, self.x2]
+                - integral[self.y2, self.x1] + integral[self.y1, self.x1])
+
+    def signatures(self, frame):
+        """İntegral görüntü ile tüm alanların ortalama/std değerlerini tek geçişte hesaplar."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        sums, sq_sums = cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+        mean = self._box_sums(sums) / self.area
+        var = self._box_sums(sq_sums) / self.area - mean ** 2
+        std = np.sqrt(np.maximum(var, 0))
+
+        return np.column_stack((mean, std))
+
+    def changed(self, signatures):
+        """İmzası eşik değerinden fazla kaymış (veya hiç sınıflandırılmamış) alanların indekslerini döndürür."""
+        delta = np.abs(signatures - self.reference).max(axis=1)
+        return np.flatnonzero(~(delta <= self.threshold))
+
+    def commit(self, indices, signatures):
+        """Sınıflandırılan alanların referans imzasını günceller."""
+        self.reference[indices] = signatures[indices]
+
+
+def get_parking_spots_bboxes(connected_components, coef=1):
     (totalLabels, label_ids, values, centroid) = connected_components
 
     slots = []
-    coef = 1
     for i in range(1, totalLabels):
 
         # Now extract the coordinate points